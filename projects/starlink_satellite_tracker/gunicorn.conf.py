@@ -0,0 +1,30 @@
+"""
+Gunicorn configuration for serving the Starlink Tracker web interface.
+
+Run from the project root:
+    gunicorn -c gunicorn.conf.py
+"""
+
+import os
+
+# The application imports its packages relative to src/
+pythonpath = 'src'
+wsgi_app = 'web.web_app:app'
+
+bind = os.environ.get('STARLINK_WEB_BIND', '0.0.0.0:5000')
+
+# Serve requests from a thread pool. Most handlers wait on Redis or the
+# network, but /api/passes runs the CPU-bound pass prediction on a cache
+# miss; with real threads that blocks only its own request (NumPy and
+# Skyfield release the GIL for much of it), and the scheduler and notifier
+# thread pools keep running. An event-loop worker such as gevent would run
+# the prediction on its hub and stall every other connection meanwhile.
+# A single worker keeps one tracker, one prediction cache and one
+# notification scheduler; more workers would each send notifications.
+worker_class = 'gthread'
+threads = int(os.environ.get('STARLINK_WEB_THREADS', 16))
+
+workers = int(os.environ.get('STARLINK_WEB_WORKERS', 1))
+
+# Loading TLE data and ephemerides on the first request can take a while
+timeout = 120
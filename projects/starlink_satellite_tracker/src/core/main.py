@@ -10,7 +10,9 @@ import logging
 import math
 import os
 import sys
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 import hashlib
@@ -56,6 +58,14 @@ except ImportError as e:
     print("Please install dependencies with: pip install -r requirements.txt")
     sys.exit(1)
 
+# Try to import xxhash for cheap cache keys, but fall back to blake2b
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+    xxhash = None  # Define xxhash as None to avoid undefined variable
+
 # Import our configuration manager
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from utils.config_manager import get_config
@@ -154,6 +164,10 @@ class StarlinkTracker:
         """Initialize the Starlink tracker with optional configuration."""
         self.config = config or get_config()
         self.satellites = []
+        # (path, mtime, size) of the TLE file self.satellites was built from
+        self._loaded_tle_key = None
+        # (satellites, names, NORAD numbers) built by get_satellite_arrays
+        self._satellite_arrays = None
         self.ts = load.timescale()  # Initialize time scale
         self.earth = None
         
@@ -184,9 +198,12 @@ class StarlinkTracker:
         self.tle_cache = TLECache(max_age_hours=6, cache_dir=self.config['data_sources']['tle_cache_path'])
         
         # Cache for prediction results
-        self.prediction_cache = {}
-        self.prediction_cache_timestamps = {}
+        # LRU of cache key -> (monotonic expiry, passes), bounded so requests
+        # for many distinct locations cannot grow it without limit
+        self.prediction_cache = OrderedDict()
         self.prediction_cache_max_age = timedelta(minutes=15)
+        self.prediction_cache_max_entries = 256
+        self._prediction_cache_lock = threading.Lock()
         
         # File-based cache for prediction results
         self.prediction_cache_dir = os.path.join(self.config['data_sources']['tle_cache_path'], 'predictions')
@@ -314,8 +331,19 @@ class StarlinkTracker:
     def _generate_prediction_cache_key(self, latitude: float, longitude: float, 
                                      hours_ahead: int, min_elevation: float) -> str:
         """Generate a cache key for prediction results."""
-        key_data = f"{latitude}_{longitude}_{hours_ahead}_{min_elevation}"
-        return hashlib.md5(key_data.encode()).hexdigest()
+        key_data = f"{latitude}_{longitude}_{hours_ahead}_{min_elevation}".encode()
+        # Cache keys need no cryptographic strength, only a cheap hash
+        if XXHASH_AVAILABLE:
+            return xxhash.xxh3_64_hexdigest(key_data)
+        return hashlib.blake2b(key_data, digest_size=8).hexdigest()
+    
+    def _store_prediction(self, cache_key: str, passes: List[Dict[str, Any]], max_age: timedelta) -> None:
+        """Store prediction results in memory, evicting the least recently used."""
+        with self._prediction_cache_lock:
+            self.prediction_cache[cache_key] = (time.monotonic() + max_age.total_seconds(), passes)
+            self.prediction_cache.move_to_end(cache_key)
+            while len(self.prediction_cache) > self.prediction_cache_max_entries:
+                self.prediction_cache.popitem(last=False)
     
     def _get_prediction_cache_filename(self, cache_key: str) -> str:
         """Generate a filename for cached prediction results."""
@@ -492,7 +520,15 @@ class StarlinkTracker:
     def _load_tle_from_file(self, filename) -> List[EarthSatellite]:
         """Load TLE data from file and create satellite objects with optimized processing."""
         try:
-            self.satellites = []
+            # Every cache hit in update_tle_data lands here; when the file has
+            # not changed since the last load, reuse the satellites already
+            # built instead of constructing them all again
+            stat = os.stat(filename)
+            file_key = (os.path.abspath(filename), stat.st_mtime_ns, stat.st_size)
+            if self.satellites and file_key == self._loaded_tle_key:
+                self.logger.debug("TLE file %s unchanged, reusing %d satellites", filename, len(self.satellites))
+                return self.satellites
+            
             with open(filename, 'r', encoding='utf-8') as f:
                 lines = f.readlines()
             
@@ -504,11 +540,8 @@ class StarlinkTracker:
             error_count = 0
             line_count = len(lines)
             
-            # Pre-allocate list with estimated size for better performance
-            estimated_satellites = line_count // 3
-            if estimated_satellites > 0:
-                self.satellites = [None] * estimated_satellites
-            
+            # Build into a local list so readers keep the previous satellites
+            # until the new set is complete
             valid_satellites = []
             
             i = 0
@@ -540,6 +573,7 @@ class StarlinkTracker:
                     break
             
             self.satellites = valid_satellites
+            self._loaded_tle_key = file_key
             self.logger.info(f"Loaded {loaded_count} satellites, {error_count} errors")
             return self.satellites
             
@@ -589,23 +623,26 @@ class StarlinkTracker:
             cache_key = self._generate_prediction_cache_key(latitude, longitude, hours_ahead, min_elevation)
             
             # Check if we have cached results in memory
-            if cache_key in self.prediction_cache:
-                cache_age = datetime.now() - self.prediction_cache_timestamps[cache_key]
-                if cache_age < self.prediction_cache_max_age:
-                    self.logger.info(f"Using in-memory cached prediction results, age: {cache_age}")
-                    return self.prediction_cache[cache_key]
-                else:
-                    # Remove expired cache entry
-                    del self.prediction_cache[cache_key]
-                    del self.prediction_cache_timestamps[cache_key]
+            with self._prediction_cache_lock:
+                entry = self.prediction_cache.get(cache_key)
+                if entry is not None:
+                    if entry[0] > time.monotonic():
+                        self.prediction_cache.move_to_end(cache_key)
+                    else:
+                        # Remove expired cache entry
+                        del self.prediction_cache[cache_key]
+                        entry = None
+            if entry is not None:
+                self.logger.info("Using in-memory cached prediction results")
+                return entry[1]
             
             # Check file-based cache
             file_cached_data = self._load_prediction_from_file(cache_key)
             if file_cached_data:
                 self.logger.info(f"Using file-based cached prediction results")
                 # Store in memory cache for faster access next time
-                self.prediction_cache[cache_key] = file_cached_data
-                self.prediction_cache_timestamps[cache_key] = datetime.now() - timedelta(minutes=5)  # Assume it's 5 minutes old
+                # Assume it's 5 minutes old
+                self._store_prediction(cache_key, file_cached_data, self.prediction_cache_max_age - timedelta(minutes=5))
                 return file_cached_data
             
             if not self.satellites:
@@ -627,12 +664,13 @@ class StarlinkTracker:
             if min_elevation < 0:
                 raise PredictionError(f"Invalid min_elevation: {min_elevation}. Must be non-negative.")
             
-            # Set observer location
-            observer = self.earth + Topos(latitude, longitude, elevation_m=altitude)
+            # Set observer location. Satellite positions are Earth-centred, so
+            # the observer must be too for satellite - observer and find_events
+            observer = Topos(latitude, longitude, elevation_m=altitude)
             
             # Time range for predictions
             t0 = self.ts.now()
-            t1 = self.ts.from_datetime(datetime.now() + timedelta(hours=hours_ahead))
+            t1 = self.ts.tt_jd(t0.tt + hours_ahead / 24.0)
             
             passes = []
             
@@ -640,51 +678,50 @@ class StarlinkTracker:
             # This reduces the number of expensive find_events calculations
             visible_satellites = []
             for satellite in self.satellites:
+                difference = satellite - observer
                 try:
                     # Quick position check to see if satellite might be visible
-                    geocentric = satellite.at(t0)
-                    difference = satellite - observer
-                    topocentric = difference.at(t0)
-                    alt, az, distance = topocentric.altaz()
+                    alt, az, distance = difference.at(t0).altaz()
                     
                     # If satellite is above horizon or close to it, include it for detailed analysis
                     if alt.degrees > -5:  # Include satellites within 5 degrees below horizon
-                        visible_satellites.append(satellite)
+                        visible_satellites.append((satellite, difference))
                 except Exception:
                     # If we can't determine position quickly, include satellite for safety
-                    visible_satellites.append(satellite)
+                    visible_satellites.append((satellite, difference))
                     continue
             
             self.logger.info(f"Pre-filtered from {len(self.satellites)} to {len(visible_satellites)} satellites for detailed analysis")
             
             # Process only potentially visible satellites for better performance
-            for satellite in visible_satellites:
+            for satellite, difference in visible_satellites:
                 try:
                     # Find events (rise, culmination, set)
                     times, events = satellite.find_events(observer, t0, t1, 
                                                         altitude_degrees=min_elevation)
+                    rise_times = times[events == 0]
+                    if not len(rise_times):
+                        continue
+                    
+                    # Positions at every rise time, and one second later for
+                    # the range rate, in two vectorized propagations
+                    alt, az, distance = difference.at(rise_times).altaz()
+                    later = difference.at(self.ts.tt_jd(rise_times.tt + 1.0 / 86400.0))
+                    velocities = np.abs(later.distance().km - distance.km)  # km/s
                     
-                    # Process events more efficiently
-                    for ti, event in zip(times, events):
-                        if event == 0:  # Rise
-                            # Get satellite position at rise time
-                            difference = satellite - observer
-                            topocentric = difference.at(ti)
-                            alt, az, distance = topocentric.altaz()
-                            
-                            # Calculate additional information only if needed
-                            velocity = self._calculate_velocity(satellite, ti, observer)
-                            brightness = self._estimate_brightness(satellite, alt.degrees, distance.km)
-                            
-                            passes.append({
-                                'satellite': satellite.name,
-                                'time': ti.utc_datetime(),
-                                'altitude': round(alt.degrees, 2),
-                                'azimuth': round(az.degrees, 2),
-                                'distance': round(distance.km, 2),
-                                'velocity': round(velocity, 2),
-                                'brightness': round(brightness, 2)
-                            })
+                    for ti, alt_deg, az_deg, distance_km, velocity in zip(
+                            rise_times.utc_datetime(), alt.degrees.tolist(), az.degrees.tolist(),
+                            distance.km.tolist(), velocities.tolist()):
+                        brightness = self._estimate_brightness(satellite, alt_deg, distance_km)
+                        passes.append({
+                            'satellite': satellite.name,
+                            'time': ti,
+                            'altitude': round(alt_deg, 2),
+                            'azimuth': round(az_deg, 2),
+                            'distance': round(distance_km, 2),
+                            'velocity': round(velocity, 2),
+                            'brightness': round(brightness, 2)
+                        })
                 except Exception as e:
                     self.logger.warning(f"Error predicting passes for {satellite.name}: {e}")
                     continue
@@ -698,8 +735,7 @@ class StarlinkTracker:
                 self.logger.info("Limited results to 1000 passes for performance")
             
             # Cache the results
-            self.prediction_cache[cache_key] = passes
-            self.prediction_cache_timestamps[cache_key] = datetime.now()
+            self._store_prediction(cache_key, passes, self.prediction_cache_max_age)
             
             # Save to file cache
             self._save_prediction_to_file(cache_key, passes)
@@ -773,6 +809,21 @@ class StarlinkTracker:
             self.logger.warning(f"Error estimating brightness: {e}")
             return 5.0  # Default magnitude
     
+    def get_satellite_arrays(self):
+        """Return (names, NORAD numbers) arrays parallel to self.satellites.
+        
+        Built once per loaded satellite list and reused until it changes, so
+        callers that only need names or ids skip per-object attribute access.
+        """
+        satellites = self.satellites
+        cached = self._satellite_arrays
+        if cached is None or cached[0] is not satellites:
+            names = np.array([sat.name for sat in satellites], dtype=object)
+            satnums = np.fromiter((sat.model.satnum for sat in satellites),
+                                  dtype=np.int32, count=len(satellites))
+            cached = self._satellite_arrays = (satellites, names, satnums)
+        return cached[1], cached[2]
+    
     def get_satellite_info(self, satellite_name: str) -> Optional[Dict[str, Any]]:
         """Get detailed information about a specific satellite."""
         try:
@@ -888,8 +939,8 @@ class StarlinkTracker:
     def clear_caches(self) -> None:
         """Clear all caches."""
         self.tle_cache.clear()
-        self.prediction_cache.clear()
-        self.prediction_cache_timestamps.clear()
+        with self._prediction_cache_lock:
+            self.prediction_cache.clear()
         self.anomaly_history.clear()
         # Clear prediction file cache
         try:
@@ -1023,9 +1074,8 @@ def main():
                 if tracker.start_scheduler():
                     print("Scheduler started. Press Ctrl+C to stop.")
                     try:
-                        # Keep running
-                        while True:
-                            time.sleep(1)
+                        # Park the main thread until the scheduler stops
+                        tracker.scheduler.wait()
                     except KeyboardInterrupt:
                         print("\nStopping scheduler...")
                         tracker.stop_scheduler()
@@ -7,6 +7,7 @@ Verifies core functionality of the tracking system
 import unittest
 import os
 import sys
+import tempfile
 from unittest.mock import patch, MagicMock
 from datetime import datetime
 
@@ -147,6 +148,47 @@ class TestStarlinkTracker(unittest.TestCase):
             mock_get.assert_called_once_with('https://test.example.com/test.txt', timeout=30)
             mock_open.assert_called()  # Should write to file
     
+    def test_load_tle_from_file_reuses_unchanged_file(self):
+        """Test that an unchanged TLE file is not parsed again."""
+        from core.main import StarlinkTracker
+        tracker = StarlinkTracker(self.test_config)
+        
+        tle = """ISS (ZARYA)
+1 25544U 98067A   23156.12345678  .00016717  00000-0  30306-3 0  9993
+2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.50377579400000
+"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tle_file = os.path.join(tmp_dir, 'tle.txt')
+            with open(tle_file, 'w', encoding='utf-8') as f:
+                f.write(tle)
+            
+            first = tracker._load_tle_from_file(tle_file)
+            self.assertEqual(len(first), 1)
+            self.assertIs(tracker._load_tle_from_file(tle_file), first)
+            
+            # A rewritten file is loaded again
+            with open(tle_file, 'w', encoding='utf-8') as f:
+                f.write(tle.replace('ISS (ZARYA)', 'ISS'))
+            reloaded = tracker._load_tle_from_file(tle_file)
+            self.assertIsNot(reloaded, first)
+            self.assertEqual(reloaded[0].name, 'ISS')
+    
+    def test_get_satellite_arrays_follow_loaded_list(self):
+        """Test that satellite arrays are reused until the list changes."""
+        from core.main import StarlinkTracker
+        tracker = StarlinkTracker(self.test_config)
+        tracker.satellites = [MagicMock(model=MagicMock(satnum=44713 + i)) for i in range(3)]
+        for i, sat in enumerate(tracker.satellites):
+            sat.name = f"STARLINK-{i}"
+        
+        names, satnums = tracker.get_satellite_arrays()
+        self.assertEqual(names.tolist(), ['STARLINK-0', 'STARLINK-1', 'STARLINK-2'])
+        self.assertEqual(satnums.tolist(), [44713, 44714, 44715])
+        self.assertIs(tracker.get_satellite_arrays()[0], names)
+        
+        tracker.satellites = tracker.satellites[:1]
+        self.assertEqual(tracker.get_satellite_arrays()[0].tolist(), ['STARLINK-0'])
+    
     def test_predict_passes_no_satellites(self):
         """Test pass prediction with no satellites loaded."""
         from core.main import StarlinkTracker
@@ -157,6 +199,37 @@ class TestStarlinkTracker(unittest.TestCase):
         
         self.assertIn("No satellites loaded", str(context.exception))
     
+    def test_predict_passes_computes_rise_events(self):
+        """Test pass prediction against a synthetic shell of fresh TLEs."""
+        from core.main import StarlinkTracker
+        from skyfield.api import EarthSatellite
+        tracker = StarlinkTracker(self.test_config)
+        tracker.earth = MagicMock()
+        
+        # Spread 200 satellites over the planes of a 53 degree shell, with
+        # an epoch of today so SGP4 propagates them without decay errors
+        now = datetime.utcnow()
+        epoch = f"{now.year % 100:02d}{now.timetuple().tm_yday:03d}.50000000"
+        line1 = f"1 44713U 19074A   {epoch}  .00001000  00000-0  70000-4 0  9990"
+        tracker.satellites = [
+            EarthSatellite(line1, f"2 44713  53.0000 {(i * 1.8) % 360:8.4f} 0001400  90.0000 "
+                                  f"{(i * 37.0) % 360:8.4f} 15.06000000 10000",
+                           f"STARLINK-{i}", tracker.ts)
+            for i in range(200)
+        ]
+        
+        with patch.object(tracker, '_load_prediction_from_file', return_value=None), \
+             patch.object(tracker, '_save_prediction_to_file'):
+            passes = tracker.predict_passes(55.7558, 37.6173, hours_ahead=24)
+        
+        self.assertGreater(len(passes), 0)
+        self.assertEqual(passes, sorted(passes, key=lambda p: p['time']))
+        for p in passes:
+            self.assertIsNotNone(p['time'].tzinfo)
+            self.assertIs(type(p['altitude']), float)
+            self.assertGreater(p['distance'], 0)
+            self.assertGreater(p['velocity'], 0)
+    
     @patch('core.main.load')
     def test_predict_passes_invalid_coordinates(self, mock_load):
         """Test pass prediction with invalid coordinates."""
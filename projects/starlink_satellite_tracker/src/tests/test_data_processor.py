@@ -4,6 +4,10 @@ Unit tests for the data processor
 """
 
 import unittest
+import csv
+import gzip
+import json
+import math
 import os
 import sys
 import tempfile
@@ -14,7 +18,7 @@ from typing import List, Dict, Any
 # Add the src directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from utils.data_processor import DataProcessor
+from utils.data_processor import DataProcessor, XXHASH_AVAILABLE
 
 
 class TestDataProcessor(unittest.TestCase):
@@ -40,26 +44,39 @@ class TestDataProcessor(unittest.TestCase):
     
     def test_load_satellite_data_empty_directory(self):
         """Test loading satellite data from empty directory."""
-        with patch('os.listdir') as mock_listdir:
-            mock_listdir.return_value = []
-            
-            processor = DataProcessor(self.test_config)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config = dict(self.test_config, data_sources={'tle_cache_path': tmp_dir})
+            processor = DataProcessor(config)
             result = processor.load_satellite_data()
             self.assertIsNone(result)
     
-    @patch('os.path.exists')
-    @patch('builtins.open', new_callable=mock_open, read_data='''STARLINK-1234
+    def test_load_satellite_data_picks_newest_file(self):
+        """Test that the most recent TLE file is loaded by default."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for date, name in (('20230101', 'OLD-1'), ('20230301', 'NEW-1'), ('20230201', 'MID-1')):
+                with open(os.path.join(tmp_dir, f'starlink_tle_{date}.txt'), 'w', encoding='utf-8') as f:
+                    f.write(f"{name}\n1 line\n2 line\n")
+            os.mkdir(os.path.join(tmp_dir, 'z_directory.txt'))
+            
+            config = dict(self.test_config, data_sources={'tle_cache_path': tmp_dir})
+            processor = DataProcessor(config)
+            result = processor.load_satellite_data()
+            
+            self.assertIsNotNone(result)
+            if result is not None:
+                self.assertEqual(result[0]['name'], 'NEW-1')
+    
+    def test_load_satellite_data_success(self):
+        """Test successful loading of satellite data."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, 'starlink_tle_20230101.txt'), 'w', encoding='utf-8') as f:
+                f.write('''STARLINK-1234
 1 12345U 12345ABC  23156.12345678  .00000000  00000-0  00000+0 0  1234
 2 12345  53.0000 123.4567 0001234 321.4567 123.4567 15.23456789 12345
 ''')
-    def test_load_satellite_data_success(self, mock_file, mock_exists):
-        """Test successful loading of satellite data."""
-        mock_exists.return_value = True
-        
-        with patch('os.listdir') as mock_listdir:
-            mock_listdir.return_value = ['starlink_tle_20230101.txt']
             
-            processor = DataProcessor(self.test_config)
+            config = dict(self.test_config, data_sources={'tle_cache_path': tmp_dir})
+            processor = DataProcessor(config)
             result = processor.load_satellite_data()
             
             self.assertIsNotNone(result)
@@ -67,6 +84,87 @@ class TestDataProcessor(unittest.TestCase):
                 self.assertIsInstance(result, list)
                 self.assertEqual(len(result), 1)
                 self.assertEqual(result[0]['name'], 'STARLINK-1234')
+                self.assertTrue(result[0]['line1'].startswith('1 12345U'))
+                self.assertTrue(result[0]['line2'].startswith('2 12345'))
+    
+    def test_loaded_records_export(self):
+        """Test that loaded satellite records behave like dicts and export cleanly."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tle_file = os.path.join(tmp_dir, 'starlink_tle_20230101.txt')
+            with open(tle_file, 'w', encoding='utf-8') as f:
+                f.write("STARLINK-1234\n1 line\n2 line\n")
+            
+            processor = DataProcessor(self.test_config)
+            satellites = processor.load_satellite_data(tle_file)
+            self.assertEqual(satellites, [{'name': 'STARLINK-1234', 'line1': '1 line', 'line2': '2 line'}])
+            self.assertEqual(satellites[0].get('missing', 'default'), 'default')
+            
+            json_file = os.path.join(tmp_dir, 'export.json')
+            self.assertTrue(processor.export_to_json(satellites, json_file))
+            with open(json_file, encoding='utf-8') as f:
+                self.assertEqual(json.load(f)['satellites'][0]['name'], 'STARLINK-1234')
+            
+            csv_file = os.path.join(tmp_dir, 'export.csv')
+            self.assertTrue(processor.export_to_csv(satellites, csv_file))
+            with open(csv_file, newline='', encoding='utf-8') as f:
+                self.assertEqual(next(csv.DictReader(f))['line2'], '2 line')
+    
+    def test_load_satellite_data_skips_blank_lines(self):
+        """Test that doubled line endings do not misalign TLE groups."""
+        with tempfile.NamedTemporaryFile(suffix='.txt', delete=False) as f:
+            f.write(b"STARLINK-1008\r\r\n1 44714U\r\r\n2 44714\r\r\n"
+                    b"STARLINK-1010\r\r\n1 44716U\r\r\n2 44716\r\r\n")
+            filename = f.name
+        try:
+            processor = DataProcessor(self.test_config)
+            result = processor.load_satellite_data(filename)
+            self.assertEqual([sat['name'] for sat in result], ['STARLINK-1008', 'STARLINK-1010'])
+            self.assertEqual(result[1]['line2'], '2 44716')
+        finally:
+            os.remove(filename)
+    
+    def test_parse_orbital_elements(self):
+        """Test vectorized parsing of TLE line 2 fields."""
+        processor = DataProcessor(self.test_config)
+        satellites = [
+            {'name': 'STARLINK-1008',
+             'line2': '2 44714  53.0546 358.1890 0001920 119.9812 240.1368 15.06411912330901'},
+            {'name': 'BROKEN', 'line2': 'line2'},
+        ]
+        
+        elements = processor.parse_orbital_elements(satellites)
+        self.assertEqual(len(elements), 2)
+        self.assertEqual(elements['norad_id'][0], 44714)
+        self.assertAlmostEqual(elements['inclination'][0], 53.0546)
+        self.assertAlmostEqual(elements['raan'][0], 358.1890)
+        self.assertAlmostEqual(elements['eccentricity'][0], 0.000192)
+        self.assertAlmostEqual(elements['mean_motion'][0], 15.06411912)
+        self.assertEqual(elements['norad_id'][1], -1)
+        self.assertTrue(math.isnan(elements['inclination'][1]))
+        self.assertEqual(len(processor.parse_orbital_elements([])), 0)
+    
+    def test_export_large_data_compressed(self):
+        """Test that large exports are compressed with the configured codec."""
+        config = dict(self.test_config, export={'compress_large_files': True, 'compression': 'gzip'})
+        processor = DataProcessor(config)
+        data = [{'name': f'STARLINK-{i}', 'line1': '1', 'line2': '2'} for i in range(1001)]
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'export.csv')
+            self.assertTrue(processor.export_to_csv(data, filename))
+            self.assertEqual(processor.compressed_filename(filename), filename + '.gz')
+            with gzip.open(filename + '.gz', 'rt', encoding='utf-8', newline='') as f:
+                self.assertEqual(len(list(csv.DictReader(f))), 1001)
+    
+    def test_load_satellite_data_empty_file(self):
+        """Test loading satellite data from an empty TLE file."""
+        with tempfile.NamedTemporaryFile(suffix='.txt', delete=False) as f:
+            filename = f.name
+        try:
+            processor = DataProcessor(self.test_config)
+            self.assertEqual(processor.load_satellite_data(filename), [])
+        finally:
+            os.remove(filename)
     
     def test_filter_satellites(self):
         """Test filtering satellites by criteria."""
@@ -93,6 +191,33 @@ class TestDataProcessor(unittest.TestCase):
         filtered = processor.filter_satellites(satellites, {})
         self.assertEqual(len(filtered), 3)
     
+    def test_ifilter_satellites_is_lazy(self):
+        """Test lazy filtering stops early and ignores criteria keys a satellite lacks."""
+        processor = DataProcessor(self.test_config)
+        
+        def satellites():
+            yield {'name': 'STARLINK-1', 'shell': 1}
+            yield {'name': 'STARLINK-2'}
+            raise AssertionError("iterated past the requested items")
+        
+        matches = processor.ifilter_satellites(satellites(), {'shell': 1})
+        self.assertEqual(next(matches)['name'], 'STARLINK-1')
+        self.assertEqual(next(matches)['name'], 'STARLINK-2')
+
+    def test_compiled_predicate_reused(self):
+        """Test that the compiled predicate is cached per criteria and matches several keys."""
+        processor = DataProcessor(self.test_config)
+        satellites = [{'name': 'A', 'shell': 1, 'tags': ['x']},
+                      {'name': 'B', 'shell': 1, 'tags': ['y']},
+                      {'name': 'C', 'shell': 2, 'tags': ['x']}]
+        criteria = {'shell': 1, 'tags': ['x']}
+
+        with patch.object(DataProcessor, '_compile_predicate',
+                          wraps=DataProcessor._compile_predicate) as mock_compile:
+            self.assertEqual([s['name'] for s in processor.ifilter_satellites(satellites, criteria)], ['A'])
+            self.assertEqual(len(list(processor.ifilter_satellites(satellites, dict(criteria)))), 1)
+            mock_compile.assert_called_once()
+
     def test_analyze_constellation(self):
         """Test constellation analysis."""
         processor = DataProcessor(self.test_config)
@@ -110,7 +235,69 @@ class TestDataProcessor(unittest.TestCase):
         self.assertIn('id_range', stats)
         self.assertEqual(stats['id_range']['min'], 1234)
         self.assertEqual(stats['id_range']['max'], 9012)
+        self.assertNotIn('orbital_elements', stats)
+    
+    def test_analyze_constellation_orbital_elements(self):
+        """Test that the analysis summarises the parsed orbital elements."""
+        processor = DataProcessor(self.test_config)
+        satellites = [
+            {'name': 'STARLINK-1008',
+             'line2': '2 44714  53.0546 358.1890 0001920 119.9812 240.1368 15.06411912330901'},
+            {'name': 'STARLINK-30000',
+             'line2': '2 56789  43.0020 120.5000 0001000  90.0000 270.0000 15.40000000 12345'},
+            {'name': 'BROKEN', 'line2': 'line2'},
+        ]
+        
+        orbital = processor.analyze_constellation(satellites)['orbital_elements']
+        self.assertEqual(orbital['parsed'], 2)
+        self.assertAlmostEqual(orbital['inclination']['min'], 43.002)
+        self.assertAlmostEqual(orbital['inclination']['max'], 53.0546)
+        self.assertAlmostEqual(orbital['eccentricity']['mean'], 0.000146)
+        self.assertAlmostEqual(orbital['mean_motion']['max'], 15.4)
+    
+    def test_analyze_constellation_refreshed_elements(self):
+        """Test that refreshed elements under the same names are analysed again."""
+        processor = DataProcessor(self.test_config)
+        before = [{'name': 'STARLINK-1008',
+                   'line2': '2 44714  53.0546 358.1890 0001920 119.9812 240.1368 15.06411912330901'}]
+        after = [{'name': 'STARLINK-1008',
+                  'line2': '2 44714  43.0020 358.1890 0001920 119.9812 240.1368 15.06411912330902'}]
+        
+        self.assertAlmostEqual(
+            processor.analyze_constellation(before)['orbital_elements']['inclination']['max'], 53.0546)
+        self.assertAlmostEqual(
+            processor.analyze_constellation(after)['orbital_elements']['inclination']['max'], 43.002)
+    
+    def test_name_id_stats_fallback_matches(self):
+        """Test that the regex fallback and the default ID scan agree."""
+        names = ['STARLINK-1234', 'STARLINK-5', 'ISS', 'DEBRIS-', 'OBJ-12B', 'A-B-3', '-7', 'STARLINK-0012']
+        expected = (5, 3, 1234)
+        self.assertEqual(DataProcessor._name_id_stats(names), expected)
+        with patch('utils.data_processor.NUMBA_AVAILABLE', False):
+            self.assertEqual(DataProcessor._name_id_stats(names), expected)
+            self.assertEqual(DataProcessor._name_id_stats(['ISS']), (0, 0, 0))
     
+    def test_generate_cache_key(self):
+        """Test that cache keys are order-independent integers with or without xxhash."""
+        processor = DataProcessor(self.test_config)
+        for xxhash_available in {XXHASH_AVAILABLE, False}:
+            with patch('utils.data_processor.XXHASH_AVAILABLE', xxhash_available):
+                key = processor._generate_cache_key("filtered", {'a': 1, 'b': 'x'})
+                self.assertIsInstance(key, int)
+                self.assertEqual(key, processor._generate_cache_key("filtered", {'b': 'x', 'a': 1}))
+                self.assertNotEqual(key, processor._generate_cache_key("filtered", {'a': 1, 'b': 'y'}))
+                self.assertNotEqual(key, processor._generate_cache_key("pred", {'a': 1, 'b': 'x'}))
+    
+    def test_analyze_constellation_same_size_no_collision(self):
+        """Test that analyses of different constellations of equal size are not shared."""
+        processor = DataProcessor(self.test_config)
+
+        first = [{'name': 'STARLINK-1000'}, {'name': 'STARLINK-2000'}]
+        second = [{'name': 'STARLINK-3000'}, {'name': 'STARLINK-4000'}]
+
+        self.assertEqual(processor.analyze_constellation(first)['id_range']['min'], 1000)
+        self.assertEqual(processor.analyze_constellation(second)['id_range']['min'], 3000)
+
     def test_analyze_empty_constellation(self):
         """Test constellation analysis with empty data."""
         processor = DataProcessor(self.test_config)
@@ -121,25 +308,86 @@ class TestDataProcessor(unittest.TestCase):
         stats = processor.analyze_constellation([])
         self.assertEqual(stats, {})
     
-    @patch('pandas.DataFrame.to_csv')
-    def test_export_to_csv_success(self, mock_to_csv):
+    def test_export_to_csv_success(self):
         """Test successful CSV export."""
-        mock_to_csv.return_value = None
+        processor = DataProcessor(self.test_config)
+        data: List[Dict[str, Any]] = [
+            {'name': 'STARLINK-1234', 'id': '1234'},
+            {'name': 'STARLINK-5678', 'id': '5678', 'extra': 'x'}
+        ]
         
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'test.csv')
+            result = processor.export_to_csv(data, filename)
+            self.assertTrue(result)
+            
+            with open(filename, newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(len(rows), 2)
+            self.assertEqual(rows[0]['name'], 'STARLINK-1234')
+            self.assertEqual(rows[0]['extra'], '')
+            self.assertEqual(rows[1]['extra'], 'x')
+    
+    def test_export_in_memory_matches_file_format(self):
+        """Test serializing exports in memory for HTTP responses."""
         processor = DataProcessor(self.test_config)
-        data: List[Dict[str, Any]] = [{'name': 'STARLINK-1234', 'id': '1234'}]
+        data = [
+            {'name': 'STARLINK-1234', 'id': '1234'},
+            {'name': 'STARLINK-5678', 'id': '5678', 'extra': 'x'}
+        ]
         
-        result = processor.export_to_csv(data, 'test.csv')
-        self.assertTrue(result)
-        mock_to_csv.assert_called_once_with('test.csv', index=False)
+        exported = json.loads(processor.export_json_bytes(data))
+        self.assertEqual(exported['count'], 2)
+        self.assertEqual(exported['satellites'], data)
+        
+        rows = list(csv.DictReader(processor.export_csv_text(data).splitlines()))
+        self.assertEqual([row['name'] for row in rows], ['STARLINK-1234', 'STARLINK-5678'])
+        self.assertEqual(rows[0]['extra'], '')
+    
+    def test_csv_chunks_join_to_full_export(self):
+        """Test that streamed CSV blocks add up to the in-memory export."""
+        processor = DataProcessor(self.test_config)
+        data = [{'name': f'STARLINK-{i}', 'id': str(i)} for i in range(5)]
+        
+        chunks = list(processor.iter_csv_chunks(data, rows_per_chunk=2))
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(''.join(chunks), processor.export_csv_text(data))
+        self.assertEqual(len(chunks[0].splitlines()), 3)
     
-    @patch('pandas.DataFrame.to_csv')
-    def test_export_to_csv_empty_data(self, mock_to_csv):
+    def test_export_reuses_identical_content(self):
+        """Test that re-exporting a loaded dataset copies the previous file."""
+        processor = DataProcessor(self.test_config)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tle_file = os.path.join(tmp_dir, 'starlink.txt')
+            with open(tle_file, 'w', encoding='utf-8') as f:
+                for i in range(200):
+                    f.write(f"STARLINK-{i}\n1 {i}\n2 {i}\n")
+            data = processor.load_satellite_data(tle_file)
+
+            first = os.path.join(tmp_dir, 'first.csv')
+            second = os.path.join(tmp_dir, 'second.csv')
+            self.assertTrue(processor.export_to_csv(data, first))
+            with patch.object(processor, '_write_csv_rows') as mock_write:
+                # The cached load returns the same list, so the export is reused
+                self.assertTrue(processor.export_to_csv(processor.load_satellite_data(tle_file), second))
+                mock_write.assert_not_called()
+            with open(first, 'rb') as f1, open(second, 'rb') as f2:
+                self.assertEqual(f1.read(), f2.read())
+
+            # A list that is not a cached dataset is always written
+            changed = data[:-1] + [{'name': 'STARLINK-X', 'line1': '1', 'line2': '2'}]
+            self.assertTrue(processor.export_to_csv(changed, second))
+            with open(second, newline='', encoding='utf-8') as f:
+                self.assertEqual(list(csv.DictReader(f))[-1]['name'], 'STARLINK-X')
+
+    @patch('builtins.open', new_callable=mock_open)
+    def test_export_to_csv_empty_data(self, mock_file):
         """Test CSV export with empty data."""
         processor = DataProcessor(self.test_config)
         result = processor.export_to_csv([], 'test.csv')
         self.assertFalse(result)
-        mock_to_csv.assert_not_called()
+        mock_file.assert_not_called()
     
     @patch('builtins.open', new_callable=mock_open)
     def test_export_to_json_success(self, mock_file):
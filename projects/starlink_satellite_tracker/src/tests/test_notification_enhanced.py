@@ -114,6 +114,20 @@ class TestEnhancedNotificationSystem(unittest.TestCase):
         )
         self.assertFalse(should_notify)
 
+    def test_should_notify_for_pass_included_patterns_reload(self):
+        """Test included pattern filtering picks up reloaded configuration."""
+        notifier = NotificationSystem(self.test_config)
+        self.assertTrue(notifier.should_notify_for_pass("ONEWEB-0012", max_elevation=45.0))
+
+        config = {'notifications': dict(self.test_config['notifications'],
+                                        included_patterns=['STARLINK', 'STAR.LINK'])}
+        notifier.reload_config(config)
+
+        self.assertTrue(notifier.should_notify_for_pass("STARLINK-1234", max_elevation=45.0))
+        self.assertTrue(notifier.should_notify_for_pass("STAR.LINK-1", max_elevation=45.0))
+        self.assertFalse(notifier.should_notify_for_pass("STARXLINK-1", max_elevation=45.0))
+        self.assertFalse(notifier.should_notify_for_pass("ONEWEB-0012", max_elevation=45.0))
+
     def test_notify_upcoming_pass_filtering(self):
         """Test that notify_upcoming_pass respects filters."""
         notifier = NotificationSystem(self.test_config)
@@ -3,16 +3,20 @@
 Unit tests for the notification system
 """
 
+import email
+import email.policy
 import unittest
 import os
+import smtplib
 import sys
+import tempfile
 from unittest.mock import patch, MagicMock
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 # Add the src directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from utils.notify import NotificationSystem
+from utils.notify import NotificationSystem, TokenBucket
 
 
 class TestNotificationSystem(unittest.TestCase):
@@ -67,8 +71,147 @@ class TestNotificationSystem(unittest.TestCase):
         mock_server.starttls.assert_called_once()
         mock_server.login.assert_called_once_with('test@test.com', 'testpass')
         mock_server.sendmail.assert_called_once()
+        mock_server.quit.assert_not_called()
+        
+        # A second send reuses the authenticated session
+        notifier.send_email_notification("Second", "Test Message", "recipient@test.com")
+        mock_smtp.assert_called_once()
+        self.assertEqual(mock_server.sendmail.call_count, 2)
+        
+        notifier.close()
         mock_server.quit.assert_called_once()
     
+    @patch('smtplib.SMTP')
+    @patch('ssl.create_default_context')
+    def test_send_email_notification_wire_format(self, mock_ssl_context, mock_smtp):
+        """Test that the message is handed to sendmail as 7-bit-safe bytes."""
+        mock_server = MagicMock()
+        mock_smtp.return_value = mock_server
+        
+        notifier = NotificationSystem(self.test_config)
+        self.assertTrue(notifier.send_email_notification("Pass Alert", "Look up 🚀", "a@test.com"))
+        
+        data = mock_server.sendmail.call_args[0][2]
+        self.assertIsInstance(data, bytes)
+        data.decode('ascii')  # No raw 8-bit content
+        self.assertIn(b"\r\n", data)
+        parsed = email.message_from_bytes(data, policy=email.policy.default)
+        self.assertEqual(parsed['Subject'], "Pass Alert")
+        self.assertEqual(parsed['From'], "test@test.com")
+        self.assertEqual(parsed.get_content().strip(), "Look up 🚀")
+    
+    @patch('smtplib.SMTP')
+    @patch('smtplib.SMTP_SSL')
+    def test_send_email_notification_implicit_tls(self, mock_smtp_ssl, mock_smtp):
+        """Test that port 465 connects with implicit TLS instead of STARTTLS."""
+        mock_server = MagicMock()
+        mock_smtp_ssl.return_value = mock_server
+        self.test_config['notifications']['email']['smtp_port'] = 465
+        
+        notifier = NotificationSystem(self.test_config)
+        self.assertTrue(notifier.send_email_notification("Subject", "Message", "a@test.com"))
+        
+        mock_smtp.assert_not_called()
+        self.assertEqual(mock_smtp_ssl.call_args[0], ('smtp.test.com', 465))
+        mock_server.starttls.assert_not_called()
+        mock_server.sendmail.assert_called_once()
+    
+    @patch('smtplib.SMTP')
+    @patch('ssl.create_default_context')
+    def test_send_email_notification_reconnects(self, mock_ssl_context, mock_smtp):
+        """Test that a dropped SMTP session is reopened and the send retried."""
+        stale_server = MagicMock()
+        stale_server.sendmail.side_effect = smtplib.SMTPServerDisconnected()
+        fresh_server = MagicMock()
+        mock_smtp.side_effect = [stale_server, fresh_server]
+        
+        notifier = NotificationSystem(self.test_config)
+        result = notifier.send_email_notification("Test Subject", "Test Message", "recipient@test.com")
+        
+        self.assertTrue(result)
+        self.assertEqual(mock_smtp.call_count, 2)
+        fresh_server.sendmail.assert_called_once()
+
+    @patch('smtplib.SMTP')
+    @patch('ssl.create_default_context')
+    def test_send_email_notification_failed_retry_closes_session(self, mock_ssl_context, mock_smtp):
+        """Test that a session opened for the retry is dropped when the retry fails."""
+        stale_server = MagicMock()
+        stale_server.sendmail.side_effect = smtplib.SMTPServerDisconnected()
+        fresh_server = MagicMock()
+        fresh_server.sendmail.side_effect = smtplib.SMTPRecipientsRefused({})
+        mock_smtp.side_effect = [stale_server, fresh_server]
+
+        notifier = NotificationSystem(self.test_config)
+        result = notifier.send_email_notification("Test Subject", "Test Message", "recipient@test.com")
+
+        self.assertFalse(result)
+        fresh_server.quit.assert_called_once()
+        self.assertIsNone(notifier._smtp)
+
+    @patch('smtplib.SMTP')
+    @patch('ssl.create_default_context')
+    def test_send_email_notification_recycles_session(self, mock_ssl_context, mock_smtp):
+        """Test that idle sessions are probed and full sessions are reopened."""
+        idle_server, capped_server, fresh_server = MagicMock(), MagicMock(), MagicMock()
+        idle_server.noop.side_effect = smtplib.SMTPServerDisconnected()
+        capped_server.noop.return_value = (250, b'OK')
+        mock_smtp.side_effect = [idle_server, capped_server, fresh_server]
+
+        self.test_config['notifications']['email']['max_messages_per_connection'] = 2
+        notifier = NotificationSystem(self.test_config)
+
+        # Idle past the health-check window and failing NOOP: reconnect
+        with patch('utils.notify.time.monotonic', side_effect=[0.0, 100.0, 100.0]):
+            notifier.send_email_notification("One", "Test Message", "recipient@test.com")
+            notifier.send_email_notification("Two", "Test Message", "recipient@test.com")
+        idle_server.noop.assert_called_once()
+        capped_server.sendmail.assert_called_once()
+
+        # The capped session carries two messages before being replaced
+        notifier.send_email_notification("Three", "Test Message", "recipient@test.com")
+        notifier.send_email_notification("Four", "Test Message", "recipient@test.com")
+        self.assertEqual(capped_server.sendmail.call_count, 2)
+        capped_server.quit.assert_called_once()
+        fresh_server.sendmail.assert_called_once()
+
+    @patch('smtplib.SMTP')
+    @patch('ssl.create_default_context')
+    def test_reload_config_switches_smtp_server(self, mock_ssl_context, mock_smtp):
+        """Test that reloading settings drops the session to the old server."""
+        old_server, new_server = MagicMock(), MagicMock()
+        mock_smtp.side_effect = [old_server, new_server]
+        
+        notifier = NotificationSystem(self.test_config)
+        self.assertTrue(notifier.send_email_notification("Subject", "Message", "a@test.com"))
+        
+        self.test_config['notifications']['email']['smtp_server'] = 'smtp.other.com'
+        notifier.reload_config(self.test_config)
+        self.assertTrue(notifier.send_email_notification("Subject", "Message", "a@test.com"))
+        
+        old_server.quit.assert_called_once()
+        mock_smtp.assert_called_with('smtp.other.com', 587)
+        new_server.sendmail.assert_called_once()
+    
+    @patch('smtplib.SMTP')
+    @patch('ssl.create_default_context')
+    def test_warm_up_opens_connections(self, mock_ssl_context, mock_smtp):
+        """Test that warm-up logs in to SMTP and primes the Telegram connection."""
+        mock_server = MagicMock()
+        mock_smtp.return_value = mock_server
+        
+        notifier = NotificationSystem(self.test_config)
+        notifier._http = MagicMock()
+        notifier.warm_up()
+        
+        mock_server.login.assert_called_once_with('test@test.com', 'testpass')
+        notifier._http.head.assert_called_once_with("https://api.telegram.org/", timeout=10)
+        
+        # The first alert reuses the warmed session without probing it
+        self.assertTrue(notifier.send_email_notification("Subject", "Message", "a@test.com"))
+        mock_smtp.assert_called_once()
+        mock_server.noop.assert_not_called()
+    
     @patch('smtplib.SMTP')
     def test_send_email_notification_disabled(self, mock_smtp):
         """Test email notification when disabled."""
@@ -132,19 +275,84 @@ class TestNotificationSystem(unittest.TestCase):
         mock_smtp.assert_not_called()
     
     @patch('utils.notify.TELEGRAM_AVAILABLE', True)
-    @patch('utils.notify.Bot')
-    def test_send_telegram_notification_success(self, mock_bot_class):
+    def test_send_telegram_notification_success(self):
         """Test successful Telegram notification."""
-        # Mock Bot behavior
-        mock_bot = MagicMock()
-        mock_bot_class.return_value = mock_bot
-        
         notifier = NotificationSystem(self.test_config)
+        # Mock the shared HTTP session
+        notifier._http = MagicMock()
+        notifier._http.post.return_value.status_code = 200
+        
         result = notifier.send_telegram_notification("Test Message")
         
         self.assertTrue(result)
-        mock_bot_class.assert_called_once_with(token='test_token')
-        mock_bot.send_message.assert_called_once_with(chat_id='test_chat_id', text='Test Message')
+        notifier._http.post.assert_called_once_with(
+            'https://api.telegram.org/bottest_token/sendMessage',
+            json={'chat_id': 'test_chat_id', 'text': 'Test Message'},
+            timeout=10
+        )
+    
+    @patch('utils.notify.TELEGRAM_AVAILABLE', True)
+    def test_send_telegram_notification_splits_long_digest(self):
+        """Test that a digest over the Bot API limit is split between passes."""
+        notifier = NotificationSystem(self.test_config)
+        notifier._http = MagicMock()
+        notifier._http.post.return_value.status_code = 200
+        passes = [f"Satellite: STARLINK-{i} 🚀\n" + "x" * 200 for i in range(40)]
+        
+        self.assertTrue(notifier.send_telegram_notification("\n\n".join(passes)))
+        
+        texts = [c.kwargs['json']['text'] for c in notifier._http.post.call_args_list]
+        self.assertEqual(len(texts), 3)
+        self.assertEqual("\n\n".join(texts), "\n\n".join(passes))
+        for text in texts:
+            self.assertLessEqual(len(text.encode('utf-16-le')) // 2, 4096)
+            self.assertTrue(text.startswith("Satellite: "))
+        
+        self.assertEqual(NotificationSystem._split_message("y" * 10, 4), ["yyyy", "yyyy", "yy"])
+    
+    @patch('utils.notify.TELEGRAM_AVAILABLE', True)
+    def test_send_telegram_notification_rate_limited(self):
+        """Test that a 429 response pauses the bucket and the send is retried."""
+        notifier = NotificationSystem(self.test_config)
+        notifier._http = MagicMock()
+        limited, ok = MagicMock(status_code=429), MagicMock(status_code=200)
+        limited.json.return_value = {'ok': False, 'parameters': {'retry_after': 3}}
+        notifier._http.post.side_effect = [limited, ok]
+        notifier._tg_bucket = MagicMock()
+        
+        self.assertTrue(notifier.send_telegram_notification("Test Message"))
+        self.assertEqual(notifier._http.post.call_count, 2)
+        notifier._tg_bucket.pause.assert_called_once_with(3)
+        self.assertEqual(notifier._tg_bucket.acquire.call_count, 2)
+    
+    def test_token_bucket_blocks_when_empty(self):
+        """Test that the token bucket sleeps once its burst is spent."""
+        clock = [0.0]
+        
+        def sleep(seconds):
+            clock[0] += seconds
+        
+        with patch('utils.notify.time.monotonic', side_effect=lambda: clock[0]), \
+             patch('utils.notify.time.sleep', side_effect=sleep) as mock_sleep:
+            bucket = TokenBucket(rate=2, capacity=2)
+            bucket.acquire()
+            bucket.acquire()
+            mock_sleep.assert_not_called()
+            bucket.acquire()
+            self.assertAlmostEqual(clock[0], 0.5)
+            
+            bucket.pause(1)
+            bucket.acquire()
+            self.assertAlmostEqual(clock[0], 2.0)
+    
+    @patch('utils.notify.TELEGRAM_AVAILABLE', True)
+    def test_send_telegram_notification_api_error(self):
+        """Test Telegram notification when the Bot API rejects the request."""
+        notifier = NotificationSystem(self.test_config)
+        notifier._http = MagicMock()
+        notifier._http.post.return_value.status_code = 400
+        
+        self.assertFalse(notifier.send_telegram_notification("Test Message"))
     
     @patch('utils.notify.TELEGRAM_AVAILABLE', True)
     def test_send_telegram_notification_disabled(self, ):
@@ -162,25 +370,30 @@ class TestNotificationSystem(unittest.TestCase):
         
         self.assertFalse(result)
     
+    @patch('utils.notify._WARNED', set())
     @patch('utils.notify.TELEGRAM_AVAILABLE', False)
     def test_send_telegram_notification_unavailable(self):
         """Test Telegram notification when library is unavailable."""
-        notifier = NotificationSystem(self.test_config)
-        result = notifier.send_telegram_notification("Test Message")
+        with self.assertLogs('utils.notify', level='WARNING') as logs:
+            notifier = NotificationSystem(self.test_config)
+            NotificationSystem(self.test_config)
+            result = notifier.send_telegram_notification("Test Message")
         
         self.assertFalse(result)
+        # The missing-library warning is logged once, not per instance
+        self.assertEqual(sum('Telegram notifications disabled' in line for line in logs.output), 1)
     
     @patch('utils.notify.TELEGRAM_AVAILABLE', True)
-    @patch('utils.notify.Bot')
-    def test_send_telegram_notification_invalid_params(self, mock_bot_class):
+    def test_send_telegram_notification_invalid_params(self):
         """Test Telegram notification with invalid parameters."""
         notifier = NotificationSystem(self.test_config)
+        notifier._http = MagicMock()
         
         # Test with empty message
         result = notifier.send_telegram_notification("")
         self.assertFalse(result)
         
-        mock_bot_class.assert_not_called()
+        notifier._http.post.assert_not_called()
     
     @patch('utils.notify.TELEGRAM_AVAILABLE', True)
     def test_send_telegram_notification_incomplete_config(self):
@@ -216,6 +429,112 @@ class TestNotificationSystem(unittest.TestCase):
                 self.assertTrue(result)
                 mock_email.assert_called_once()
                 mock_telegram.assert_called_once()
+                
+                # The send pool is kept between passes and released on close
+                executor = notifier._executor
+                self.assertIsNotNone(executor)
+                notifier.notify_upcoming_pass("STARLINK-5678", datetime.now(), 50.0, 10.0)
+                self.assertIs(notifier._executor, executor)
+                notifier.close()
+                self.assertIsNone(notifier._executor)
+    
+    @patch('smtplib.SMTP')
+    @patch('ssl.create_default_context')
+    def test_send_email_notification_multiple_recipients(self, mock_ssl_context, mock_smtp):
+        """Test that several recipients share one SMTP transaction."""
+        mock_server = MagicMock()
+        mock_smtp.return_value = mock_server
+        
+        notifier = NotificationSystem(self.test_config)
+        result = notifier.send_email_notification("Test Subject", "Test Message", "a@test.com, b@test.com")
+        
+        self.assertTrue(result)
+        mock_server.sendmail.assert_called_once()
+        self.assertEqual(mock_server.sendmail.call_args[0][1], ['a@test.com', 'b@test.com'])
+    
+    def test_notify_upcoming_passes_digest(self):
+        """Test that several passes are coalesced into one message per channel."""
+        notifier = NotificationSystem(self.test_config)
+        passes = [
+            {'satellite': 'STARLINK-1234', 'time': datetime.now(), 'altitude': 65.5, 'azimuth': 42.3},
+            {'satellite': 'STARLINK-5678', 'time': datetime.now(), 'altitude': 45.0, 'azimuth': 120.0},
+            {'satellite': 'STARLINK-LOW', 'time': datetime.now(), 'altitude': 1.0, 'azimuth': 10.0},
+        ]
+        
+        with patch.object(notifier, 'send_email_notification', return_value=True) as mock_email:
+            with patch.object(notifier, 'send_telegram_notification', return_value=True) as mock_telegram:
+                self.assertTrue(notifier.notify_upcoming_passes(passes))
+        
+        mock_email.assert_called_once()
+        mock_telegram.assert_called_once()
+        message = mock_telegram.call_args[0][0]
+        self.assertIn('2 upcoming passes', message)
+        self.assertIn('STARLINK-5678', message)
+        self.assertNotIn('STARLINK-LOW', message)
+        notifier.close()
+    
+    def test_format_pass_details_time_zones(self):
+        """Test that cached pass times keep each pass's own time zone."""
+        utc_time = datetime(2025, 1, 1, 12, 0, 0, 500, tzinfo=timezone.utc)
+        msk_time = utc_time.astimezone(timezone(timedelta(hours=3)))
+        
+        self.assertIn("Time: 2025-01-01 12:00:00", NotificationSystem._format_pass_details(
+            "STARLINK-1234", utc_time, 45.0, 120.0, 1.0, 7.5))
+        self.assertIn("Time: 2025-01-01 15:00:00", NotificationSystem._format_pass_details(
+            "STARLINK-1234", msk_time, 45.0, 120.0, 1.0, 7.5))
+    
+    def test_notify_upcoming_pass_deduplicates(self):
+        """Test that a pass already announced is not sent again, unless sending failed."""
+        notifier = NotificationSystem(self.test_config)
+        pass_time = datetime(2025, 1, 1, 12, 0, 15)
+        
+        with patch.object(notifier, 'send_email_notification', return_value=True) as mock_email:
+            with patch.object(notifier, 'send_telegram_notification',
+                              side_effect=[False, True]) as mock_telegram:
+                self.assertFalse(notifier.notify_upcoming_pass("STARLINK-1234", pass_time, 65.5, 42.3))
+                # Only the channel that failed is retried
+                self.assertTrue(notifier.notify_upcoming_pass("STARLINK-1234", pass_time, 65.5, 42.3))
+                # Same satellite and minute, re-predicted a few seconds later
+                self.assertTrue(notifier.notify_upcoming_passes([
+                    {'satellite': 'STARLINK-1234', 'time': pass_time.replace(second=40), 'altitude': 65.5}]))
+        notifier.close()
+        
+        mock_email.assert_called_once()
+        self.assertEqual(mock_telegram.call_count, 2)
+    
+    def test_notify_upcoming_pass_no_channels(self):
+        """Test that a pass is not reported as sent when no channel is enabled."""
+        self.test_config['notifications']['email']['enabled'] = False
+        self.test_config['notifications']['telegram']['enabled'] = False
+        notifier = NotificationSystem(self.test_config)
+        pass_time = datetime(2025, 1, 1, 12, 0, 0)
+        
+        self.assertFalse(notifier.notify_upcoming_pass("STARLINK-1234", pass_time, 65.5, 42.3))
+        self.assertFalse(notifier.notify_upcoming_passes([
+            {'satellite': 'STARLINK-1234', 'time': pass_time, 'altitude': 65.5}]))
+        notifier.close()
+    
+    def test_sent_notifications_persist_across_instances(self):
+        """Test that a restarted notifier does not resend a recorded pass."""
+        pass_time = datetime(2025, 1, 1, 12, 0, 0)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.test_config['notifications']['sent_cache_path'] = os.path.join(tmp_dir, 'sent.db')
+            
+            first = NotificationSystem(self.test_config)
+            with patch.object(first, 'send_email_notification', return_value=True), \
+                    patch.object(first, 'send_telegram_notification', return_value=False):
+                self.assertFalse(first.notify_upcoming_pass("STARLINK-1234", pass_time, 65.5, 42.3))
+            first.close()
+            
+            restarted = NotificationSystem(self.test_config)
+            with patch.object(restarted, 'send_email_notification', return_value=True) as mock_email, \
+                    patch.object(restarted, 'send_telegram_notification', return_value=True) as mock_telegram:
+                self.assertTrue(restarted.notify_upcoming_pass("STARLINK-1234", pass_time, 65.5, 42.3))
+                self.assertTrue(restarted.notify_upcoming_pass("STARLINK-5678", pass_time, 65.5, 42.3))
+            restarted.close()
+            
+            self.assertEqual(mock_email.call_count, 1)
+            self.assertEqual(mock_telegram.call_count, 2)
     
     def test_notify_upcoming_pass_invalid_params(self):
         """Test notification of upcoming pass with invalid parameters."""
@@ -6,12 +6,15 @@ Unit tests for the scheduler
 import unittest
 import os
 import sys
+import threading
+import time
 from unittest.mock import patch, MagicMock
+from datetime import datetime, timedelta, timezone
 
 # Add the src directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from utils.scheduler import StarlinkScheduler, CronParser
+from utils.scheduler import StarlinkScheduler, CronParser, JobExecutionCache, CRONITER_AVAILABLE
 
 
 class TestCronParser(unittest.TestCase):
@@ -32,6 +35,26 @@ class TestCronParser(unittest.TestCase):
         with self.assertRaises(ValueError):
             CronParser.parse_cron_expression("0 0 */6 *")  # Missing weekday part
     
+    @patch('utils.scheduler.CRONITER_AVAILABLE', False)
+    def test_next_run_time_fallback(self):
+        """Test computing next run times without croniter."""
+        after = datetime(2025, 1, 1, 10, 20)
+        self.assertEqual(CronParser.next_run_time('*/15 * * * *', after), datetime(2025, 1, 1, 10, 35))
+        self.assertEqual(CronParser.next_run_time('*/5 * * * *', after), datetime(2025, 1, 1, 10, 25))
+        self.assertEqual(CronParser.next_run_time('0 0 * * *', after), datetime(2025, 1, 2, 0, 0))
+        self.assertEqual(CronParser.next_run_time('0 0 */6 * *', after), datetime(2025, 1, 1, 16, 20))
+        self.assertIsNone(CronParser.next_run_time('0 0 * *', after))
+    
+    @unittest.skipUnless(CRONITER_AVAILABLE, "croniter not installed")
+    def test_next_run_time_croniter(self):
+        """Test exact cron semantics with croniter."""
+        after = datetime(2025, 1, 1, 10, 20)
+        self.assertEqual(CronParser.next_run_time('*/15 * * * *', after), datetime(2025, 1, 1, 10, 30))
+        self.assertEqual(CronParser.next_run_time('30 9 * * 1', after), datetime(2025, 1, 6, 9, 30))
+        # The legacy six-hour expression keeps its old meaning
+        self.assertEqual(CronParser.next_run_time('0 0 */6 * *', after), datetime(2025, 1, 1, 12, 0))
+        self.assertIsNone(CronParser.next_run_time('99 * * * *', after))
+    
     def test_is_simple_interval(self):
         """Test checking for simple intervals."""
         self.assertTrue(CronParser._is_simple_interval('*/15', '*'))
@@ -40,6 +63,22 @@ class TestCronParser(unittest.TestCase):
         self.assertFalse(CronParser._is_simple_interval('*/15', '1'))
 
 
+class TestJobExecutionCache(unittest.TestCase):
+    
+    @patch('utils.scheduler.time.monotonic')
+    def test_should_execute_uses_monotonic_clock(self, mock_monotonic):
+        """Test that the minimum interval is measured on the monotonic clock."""
+        cache = JobExecutionCache()
+        mock_monotonic.return_value = 1000.0
+        self.assertTrue(cache.should_execute("TLE Update", 300))
+        
+        mock_monotonic.return_value = 1299.0
+        self.assertFalse(cache.should_execute("TLE Update", 300))
+        
+        mock_monotonic.return_value = 1300.0
+        self.assertTrue(cache.should_execute("TLE Update", 300))
+
+
 class TestStarlinkScheduler(unittest.TestCase):
     
     def setUp(self):
@@ -60,31 +99,160 @@ class TestStarlinkScheduler(unittest.TestCase):
         self.assertEqual(scheduler.config, self.test_config)
         self.assertFalse(scheduler.running)
     
-    @patch('schedule.clear')
-    @patch('utils.scheduler.CronParser.cron_to_schedule_job')
-    def test_setup_scheduled_tasks_success(self, mock_cron_to_schedule, mock_clear):
+    def test_setup_scheduled_tasks_success(self):
         """Test successful setup of scheduled tasks."""
-        mock_cron_to_schedule.return_value = True
-        mock_clear.return_value = None
-        
         scheduler = StarlinkScheduler(self.test_config)
         result = scheduler.setup_scheduled_tasks()
         
         self.assertTrue(result)
-        self.assertEqual(mock_cron_to_schedule.call_count, 3)  # Three tasks
-        mock_clear.assert_called_once()
+        jobs = scheduler.get_scheduled_jobs()
+        self.assertEqual(len(jobs), 3)  # Three tasks
+        self.assertEqual({job['name'] for job in jobs},
+                         {'TLE Update', 'Prediction Update', 'Notification Check'})
+        
+        # Setting up again replaces rather than duplicates the jobs
+        scheduler.setup_scheduled_tasks()
+        self.assertEqual(len(scheduler.get_scheduled_jobs()), 3)
+        self.assertEqual(len(scheduler._jobs), 3)
     
-    @patch('schedule.clear')
-    @patch('utils.scheduler.CronParser.cron_to_schedule_job')
-    def test_setup_scheduled_tasks_no_config(self, mock_cron_to_schedule, mock_clear):
+    @patch('utils.scheduler.CronParser.next_run_time')
+    def test_setup_scheduled_tasks_no_config(self, mock_next_run_time):
         """Test setup of scheduled tasks with no config."""
         # Pass a config with no 'schedule' section
         scheduler = StarlinkScheduler({'data_sources': {}})
         result = scheduler.setup_scheduled_tasks()
         
         self.assertFalse(result)
-        mock_cron_to_schedule.assert_not_called()
-        mock_clear.assert_called_once()
+        mock_next_run_time.assert_not_called()
+        self.assertEqual(scheduler.get_scheduled_jobs(), [])
+    
+    def test_run_scheduler_fires_due_job(self):
+        """Test that the loop runs a due job and stops promptly while parked."""
+        scheduler = StarlinkScheduler(self.test_config)
+        fired = threading.Event()
+        now = datetime.now()
+        
+        with patch('utils.scheduler.CronParser.next_run_time',
+                   side_effect=[now, now + timedelta(hours=1)]):
+            with patch.object(scheduler, 'setup_scheduled_tasks', return_value=True):
+                scheduler._add_job("Test Job", "*/15 * * * *", fired.set)
+                self.assertTrue(scheduler.start_scheduler())
+                self.assertTrue(fired.wait(timeout=5))
+        
+        # The job was rescheduled an hour out; stopping must not wait for it
+        started = time.monotonic()
+        self.assertTrue(scheduler.stop_scheduler())
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertFalse(scheduler.thread.is_alive())
+    
+    def test_run_scheduler_fires_coinciding_jobs(self):
+        """Test that jobs due at the same time all run and are rescheduled."""
+        scheduler = StarlinkScheduler(self.test_config)
+        first, second = threading.Event(), threading.Event()
+        now = datetime.now()
+        later = now + timedelta(hours=1)
+        
+        with patch('utils.scheduler.CronParser.next_run_time',
+                   side_effect=[now, now, later, later]):
+            with patch.object(scheduler, 'setup_scheduled_tasks', return_value=True):
+                scheduler._add_job("Job 1", "*/15 * * * *", first.set)
+                scheduler._add_job("Job 2", "*/30 * * * *", second.set)
+                self.assertTrue(scheduler.start_scheduler())
+                self.assertTrue(first.wait(timeout=5))
+                self.assertTrue(second.wait(timeout=5))
+        
+                deadline = time.monotonic() + 5
+                while len(scheduler._jobs) < 2 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                self.assertEqual(len(scheduler._jobs), 2)
+        
+        self.assertTrue(scheduler.stop_scheduler())
+    
+    def test_wait_returns_when_stopped(self):
+        """Test that wait blocks while running and returns once stopped."""
+        scheduler = StarlinkScheduler(self.test_config)
+        with patch.object(scheduler, 'setup_scheduled_tasks', return_value=True):
+            self.assertTrue(scheduler.start_scheduler())
+        self.assertFalse(scheduler.wait(timeout=0.01))
+        
+        threading.Timer(0.05, scheduler.stop_scheduler).start()
+        self.assertTrue(scheduler.wait(timeout=5))
+    
+    def test_slow_job_does_not_block_others(self):
+        """Test that jobs run on workers and a busy job is not started twice."""
+        scheduler = StarlinkScheduler(self.test_config)
+        release, started, fast_done = threading.Event(), threading.Event(), threading.Event()
+        slow_runs = []
+        
+        def slow():
+            slow_runs.append(1)
+            started.set()
+            release.wait(5)
+        
+        scheduler._add_job("Slow", "*/15 * * * *", slow)
+        scheduler._add_job("Fast", "*/15 * * * *", fast_done.set)
+        slow_job = scheduler._job_registry["Slow"]
+        
+        scheduler._dispatch_job(slow_job)
+        self.assertTrue(started.wait(5))
+        scheduler._dispatch_job(scheduler._job_registry["Fast"])
+        self.assertTrue(fast_done.wait(5))
+        
+        # Still running, so the next due run is skipped
+        scheduler._dispatch_job(slow_job)
+        release.set()
+        scheduler._job_executor.shutdown(wait=True)
+        self.assertEqual(len(slow_runs), 1)
+        self.assertEqual(scheduler._running_jobs, set())
+    
+    def test_busy_jobs_do_not_starve_notification_check(self):
+        """Test that every registered job gets its own worker."""
+        scheduler = StarlinkScheduler(self.test_config)
+        release, notified = threading.Event(), threading.Event()
+        
+        scheduler._add_job("TLE Update", "0 */6 * * *", lambda: release.wait(5))
+        scheduler._add_job("Prediction Update", "0 * * * *", lambda: release.wait(5))
+        scheduler._add_job("Notification Check", "*/15 * * * *", notified.set)
+        
+        for name in ("TLE Update", "Prediction Update", "Notification Check"):
+            scheduler._dispatch_job(scheduler._job_registry[name])
+        self.assertTrue(notified.wait(5))
+        
+        release.set()
+        scheduler._job_executor.shutdown(wait=True)
+    
+    def test_run_scheduler_backs_off_on_repeated_errors(self):
+        """Test that consecutive loop errors wait progressively longer."""
+        scheduler = StarlinkScheduler(self.test_config)
+        stop_event = threading.Event()
+        scheduler._jobs_lock = None  # Every pass through the loop fails
+        waits = []
+        
+        def record_wait(timeout=None):
+            waits.append(timeout)
+            if len(waits) == 7:
+                stop_event.set()
+            return False
+        
+        with patch.object(scheduler._wakeup, 'wait', side_effect=record_wait):
+            scheduler._run_scheduler(stop_event)
+        
+        self.assertEqual(waits, [10, 20, 40, 80, 160, 300, 300])
+    
+    def test_stale_loop_exits_after_restart(self):
+        """Test that a loop stopped mid-job does not resume once restarted."""
+        scheduler = StarlinkScheduler(self.test_config)
+        stale_job = MagicMock()
+        scheduler._add_job("Stale Job", "*/15 * * * *", stale_job)
+        stale_event = threading.Event()
+        stale_event.set()
+        
+        # The scheduler is running again, but under a new stop event
+        scheduler.running = True
+        scheduler._run_scheduler(stale_event)
+        
+        stale_job.assert_not_called()
+        self.assertEqual(len(scheduler._jobs), 1)
     
     def test_start_scheduler_not_running(self):
         """Test starting scheduler when not already running."""
@@ -102,6 +270,19 @@ class TestStarlinkScheduler(unittest.TestCase):
                 mock_thread.assert_called_once()
                 mock_thread_instance.start.assert_called_once()
     
+    @patch('utils.notify.NotificationSystem')
+    def test_start_scheduler_warms_up_notifier(self, mock_notifier_class):
+        """Test that starting with a tracker opens notification connections early."""
+        scheduler = StarlinkScheduler(self.test_config, tracker=MagicMock())
+        
+        with patch.object(scheduler, 'setup_scheduled_tasks', return_value=True):
+            self.assertTrue(scheduler.start_scheduler())
+        self.assertTrue(scheduler.stop_scheduler())
+        
+        notifier = mock_notifier_class.return_value
+        notifier.warm_up.assert_called_once()
+        notifier.close.assert_called_once()
+    
     def test_start_scheduler_already_running(self):
         """Test starting scheduler when already running."""
         scheduler = StarlinkScheduler(self.test_config)
@@ -118,60 +299,96 @@ class TestStarlinkScheduler(unittest.TestCase):
         scheduler.running = True
         # Create a mock thread object
         scheduler.thread = MagicMock()
+        notifier = MagicMock()
+        scheduler._notifier = notifier
         
         with patch('threading.Thread.join') as mock_join:
-            with patch('schedule.clear') as mock_clear:
+            with patch.object(scheduler, '_clear_jobs') as mock_clear:
                 result = scheduler.stop_scheduler()
                 
                 self.assertTrue(result)
                 self.assertFalse(scheduler.running)
+                self.assertTrue(scheduler._stop_event.is_set())
                 scheduler.thread.join.assert_called_once_with(timeout=5)
                 mock_clear.assert_called_once()
+                # Pooled notification connections are released on stop
+                notifier.close.assert_called_once()
+                self.assertIsNone(scheduler._notifier)
+    
+    @patch('utils.notify.NotificationSystem')
+    def test_check_notifications_sends_digest_in_background(self, mock_notifier_class):
+        """Test that due passes are delivered as one digest off the scheduler thread."""
+        tracker = MagicMock()
+        soon = datetime.now() + timedelta(minutes=10)
+        later = datetime.now() + timedelta(hours=1)
+        tracker.predict_passes.return_value = [
+            {'satellite': 'STARLINK-1', 'time': soon},
+            {'satellite': 'STARLINK-2', 'time': soon},
+            {'satellite': 'STARLINK-3', 'time': later},
+        ]
+        scheduler = StarlinkScheduler(self.test_config, tracker=tracker)
+        
+        scheduler._check_notifications()
+        notifier = mock_notifier_class.return_value
+        scheduler._close_notifier()
+        
+        notifier.notify_upcoming_passes.assert_called_once()
+        due = notifier.notify_upcoming_passes.call_args[0][0]
+        self.assertEqual([p['satellite'] for p in due], ['STARLINK-1', 'STARLINK-2'])
+        notifier.close.assert_called_once()
+    
+    @patch('utils.notify.NotificationSystem')
+    def test_check_notifications_aware_pass_times(self, mock_notifier_class):
+        """Test that the tracker's aware UTC pass times are compared correctly."""
+        tracker = MagicMock()
+        now = datetime.now(timezone.utc)
+        tracker.predict_passes.return_value = [
+            {'satellite': 'STARLINK-1', 'time': now + timedelta(minutes=10)},
+            {'satellite': 'STARLINK-2', 'time': now - timedelta(minutes=5)},
+            {'satellite': 'STARLINK-3', 'time': now + timedelta(hours=1)},
+        ]
+        scheduler = StarlinkScheduler(self.test_config, tracker=tracker)
+        
+        scheduler._check_notifications()
+        notifier = mock_notifier_class.return_value
+        scheduler._close_notifier()
+        
+        notifier.notify_upcoming_passes.assert_called_once()
+        due = notifier.notify_upcoming_passes.call_args[0][0]
+        self.assertEqual([p['satellite'] for p in due], ['STARLINK-1'])
     
     def test_stop_scheduler_not_running(self):
         """Test stopping scheduler when not running."""
         scheduler = StarlinkScheduler(self.test_config)
         
-        with patch('schedule.clear') as mock_clear:
+        with patch.object(scheduler, '_clear_jobs') as mock_clear:
             result = scheduler.stop_scheduler()
             
             self.assertTrue(result)
             self.assertFalse(scheduler.running)
             mock_clear.assert_called_once()
     
-    @patch('schedule.get_jobs')
-    def test_get_scheduled_jobs_success(self, mock_get_jobs):
+    def test_get_scheduled_jobs_success(self):
         """Test getting scheduled jobs successfully."""
-        # Mock job objects
-        mock_job1 = MagicMock()
-        mock_job1.tags = {'Test Job 1'}
-        mock_job1.next_run = '2023-01-01 12:00:00'
-        mock_job1.interval = '30 minutes'
-        
-        mock_job2 = MagicMock()
-        mock_job2.tags = {'Test Job 2'}
-        mock_job2.next_run = '2023-01-01 13:00:00'
-        mock_job2.interval = '1 hour'
-        
-        mock_get_jobs.return_value = [mock_job1, mock_job2]
-        
         scheduler = StarlinkScheduler(self.test_config)
+        scheduler._add_job("Test Job 1", "*/30 * * * *", MagicMock())
+        scheduler._add_job("Test Job 2", "0 * * * *", MagicMock())
+        
         jobs = scheduler.get_scheduled_jobs()
         
         self.assertEqual(len(jobs), 2)
         self.assertEqual(jobs[0]['name'], 'Test Job 1')
         self.assertEqual(jobs[1]['name'], 'Test Job 2')
+        self.assertEqual(jobs[1]['interval'], '0 * * * *')
+        self.assertIsInstance(jobs[0]['next_run'], datetime)
     
-    @patch('schedule.get_jobs')
-    def test_get_scheduled_jobs_exception(self, mock_get_jobs):
+    def test_get_scheduled_jobs_exception(self):
         """Test getting scheduled jobs when an exception occurs."""
-        mock_get_jobs.side_effect = Exception("Test exception")
-        
         scheduler = StarlinkScheduler(self.test_config)
+        scheduler._job_registry = None  # Force an error while listing jobs
         jobs = scheduler.get_scheduled_jobs()
         
         self.assertEqual(jobs, [])  # Should return empty list on exception
 
-
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
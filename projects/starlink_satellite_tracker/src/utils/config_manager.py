@@ -78,7 +78,7 @@ class ConfigManager:
                 "matplotlib_2d": True
             },
             "schedule": {
-                "tle_update_cron": "0 0 */6 * *",
+                "tle_update_cron": "0 */6 * * *",
                 "prediction_update_cron": "*/30 * * * *",
                 "notification_check_cron": "*/15 * * * *"
             },
@@ -95,7 +95,8 @@ class ConfigManager:
                     "smtp_port": 587,
                     "username": "",
                     "password": "",
-                    "recipient": ""
+                    "recipient": "",
+                    "max_messages_per_connection": 100
                 },
                 "telegram": {
                     "enabled": False,
@@ -114,13 +115,16 @@ class ConfigManager:
                 "excluded_satellites": [],
                 "excluded_patterns": ["DEBRIS", "TEST"],
                 "included_satellites": [],
-                "included_patterns": []
+                "included_patterns": [],
+                "sent_cache_path": "",
+                "sent_cache_ttl_seconds": 7200
             },
             "export": {
                 "default_format": "json",
                 "include_tle_data": True,
                 "include_predictions": True,
-                "compress_large_files": True
+                "compress_large_files": True,
+                "compression": "zstd"
             },
             "advanced": {
                 "enable_ml_predictions": False,
@@ -4,19 +4,151 @@ Data processing utilities for Starlink Satellite Tracker
 Handles data analysis, filtering, and export functionality
 """
 
-import pandas as pd
 import json
 import csv
+import gzip
+import io
 import os
+import re
+import mmap
+import shutil
 from datetime import datetime, timedelta
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional
 import hashlib
 import math
+from collections import OrderedDict
+from collections.abc import Mapping
+from contextlib import contextmanager
+
+import numpy as np
 
 # Import our configuration manager
 from utils.config_manager import get_config
 
+# Try to import orjson for faster exports, but fall back to stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None  # Define orjson as None to avoid undefined variable
+
+# Try to import zstandard for export compression, but fall back to gzip
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    zstandard = None  # Define zstandard as None to avoid undefined variable
+
+# Try to import xxhash for cheap cache keys, but fall back to blake2b
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+    xxhash = None  # Define xxhash as None to avoid undefined variable
+
+# Try to import numba for JIT-compiled name scans, but fall back to regex
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    numba = None  # Define numba as None to avoid undefined variable
+
+
+class SatelliteRecord(Mapping):
+    """Compact read-only TLE record with the same mapping interface as a dict."""
+    
+    __slots__ = ('name', 'line1', 'line2')
+    
+    def __init__(self, name: str, line1: str, line2: str):
+        self.name = name
+        self.line1 = line1
+        self.line2 = line2
+    
+    def __getitem__(self, key: str) -> str:
+        if key in SatelliteRecord.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def __iter__(self):
+        return iter(SatelliteRecord.__slots__)
+    
+    def __len__(self) -> int:
+        return len(SatelliteRecord.__slots__)
+    
+    def __repr__(self) -> str:
+        return f"SatelliteRecord(name={self.name!r}, line1={self.line1!r}, line2={self.line2!r})"
+
+
+# Fixed-column fields of TLE line 2 as (name, 0-based offset, width)
+TLE_LINE2_FIELDS = (
+    ('norad_id', 2, 5),
+    ('inclination', 8, 8),
+    ('raan', 17, 8),
+    ('eccentricity', 26, 7),
+    ('arg_perigee', 34, 8),
+    ('mean_anomaly', 43, 8),
+    ('mean_motion', 52, 11),
+)
+TLE_LINE_LENGTH = 69
+
+# Raw byte view over a padded line 2, one 'S' field per column range
+_TLE_LINE2_RAW_DTYPE = np.dtype({
+    'names': [name for name, _, _ in TLE_LINE2_FIELDS],
+    'formats': [f'S{width}' for _, _, width in TLE_LINE2_FIELDS],
+    'offsets': [offset for _, offset, _ in TLE_LINE2_FIELDS],
+    'itemsize': TLE_LINE_LENGTH,
+})
+
+ORBITAL_ELEMENTS_DTYPE = np.dtype([
+    ('norad_id', np.int32),
+    ('inclination', np.float64),
+    ('raan', np.float64),
+    ('eccentricity', np.float64),
+    ('arg_perigee', np.float64),
+    ('mean_anomaly', np.float64),
+    ('mean_motion', np.float64),
+])
+
+# Number of loaded or filtered lists whose dataset cache key is remembered
+# for export reuse
+DATASET_KEYS_MAX = 16
+
+# Numeric suffix of names such as "STARLINK-1234"
+_NAME_ID_RE = re.compile(r'-([0-9]+)\Z')
+
+if NUMBA_AVAILABLE:
+    @numba.njit(parallel=True, cache=True)
+    def _name_id_stats(buf, offsets):
+        """Return (count, min, max) of the numeric suffixes of packed names.
+
+        ``buf`` holds the UTF-8 names back to back and name ``i`` spans
+        ``buf[offsets[i]:offsets[i + 1]]``. Suffixes longer than 18 digits
+        are skipped so the value fits in int64.
+        """
+        n = offsets.shape[0] - 1
+        ids = np.full(n, -1, np.int64)
+        for i in numba.prange(n):
+            start = offsets[i]
+            end = offsets[i + 1]
+            j = end
+            value = 0
+            scale = 1
+            while j > start and end - j < 18 and 0x30 <= buf[j - 1] <= 0x39:
+                j -= 1
+                value += (buf[j] - 0x30) * scale
+                scale *= 10
+            if start < j < end and buf[j - 1] == 0x2D:
+                ids[i] = value
+        found = ids[ids >= 0]
+        if found.shape[0] == 0:
+            return 0, 0, 0
+        return found.shape[0], found.min(), found.max()
+
 
 class DataCache:
     """Enhanced in-memory cache with LRU eviction and time-based expiration."""
@@ -36,15 +168,15 @@ class DataCache:
             if datetime.now() - timestamp > self.ttl:
                 # Remove expired item
                 del self.cache[key]
-                self.logger.debug(f"Removed expired cache entry: {key}")
+                self.logger.debug("Removed expired cache entry: %s", key)
                 return None
             
             # Update access count
             self.cache[key] = (value, timestamp, access_count + 1)
-            self.logger.debug(f"Cache hit for key: {key}")
+            self.logger.debug("Cache hit for key: %s", key)
             return value
         
-        self.logger.debug(f"Cache miss for key: {key}")
+        self.logger.debug("Cache miss for key: %s", key)
         return None
     
     def put(self, key: str, value: Any) -> None:
@@ -55,11 +187,11 @@ class DataCache:
             lru_key = min(self.cache.keys(), 
                          key=lambda k: (self.cache[k][2], self.cache[k][1]))
             del self.cache[lru_key]
-            self.logger.debug(f"Removed LRU cache entry: {lru_key}")
+            self.logger.debug("Removed LRU cache entry: %s", lru_key)
         
         # Store with current timestamp and zero access count
         self.cache[key] = (value, datetime.now(), 0)
-        self.logger.debug(f"Added to cache: {key}")
+        self.logger.debug("Added to cache: %s", key)
     
     def clear(self) -> None:
         """Clear all cache entries."""
@@ -82,7 +214,7 @@ class DataCache:
             del self.cache[key]
         
         if expired_keys:
-            self.logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
+            self.logger.debug("Cleaned up %d expired cache entries", len(expired_keys))
         
         return len(expired_keys)
 
@@ -110,32 +242,44 @@ class DataProcessor:
         
         # Cleanup expired cache entries periodically
         self._last_cleanup = datetime.now()  # Cache expires after 30 minutes
+        
+        # Cache keys of recently loaded or filtered lists, by list identity,
+        # so exports of those lists can be memoized without hashing rows
+        self._dataset_keys = OrderedDict()
     
-    def _generate_cache_key(self, filename: str, criteria: Optional[Dict[str, Any]] = None) -> str:
-        """Generate a cache key based on filename and criteria."""
-        key_data = filename
+    def _generate_cache_key(self, filename: str, criteria: Optional[Dict[str, Any]] = None) -> int:
+        """Generate an integer cache key based on filename and criteria."""
+        parts = [filename.encode()]
         if criteria:
-            # Sort criteria to ensure consistent keys
-            sorted_criteria = sorted(criteria.items())
-            key_data += str(sorted_criteria)
+            # Sort criteria to ensure consistent keys; separators keep
+            # adjacent keys and values from running together
+            for key, value in sorted(criteria.items()):
+                parts.extend((b'\x00', key.encode(), b'\x01', repr(value).encode()))
+        payload = b''.join(parts)
         
-        # Create hash of key data
-        return hashlib.md5(key_data.encode()).hexdigest()
+        # Cache keys need no cryptographic strength, only a cheap hash
+        if XXHASH_AVAILABLE:
+            return xxhash.xxh3_64_intdigest(payload)
+        return int.from_bytes(hashlib.blake2b(payload, digest_size=8).digest(), 'little')
     
-    def load_satellite_data(self, filename: Optional[str] = None) -> Optional[List[Dict[str, str]]]:
+    def load_satellite_data(self, filename: Optional[str] = None) -> Optional[List[SatelliteRecord]]:
         """Load satellite data from TLE file or cache."""
         try:
             # Periodically cleanup expired cache entries
             self._cleanup_cache_if_needed()
             
             if filename is None:
-                # Find the most recent TLE file
+                # Find the most recent TLE file (names embed the date, so the
+                # lexicographic maximum is the newest) in a single pass
                 try:
-                    files = [f for f in os.listdir(self.data_directory) if f.endswith('.txt')]
-                    if not files:
+                    with os.scandir(self.data_directory) as entries:
+                        newest = max((entry.name for entry in entries
+                                      if entry.name.endswith('.txt') and entry.is_file()),
+                                     default=None)
+                    if newest is None:
                         self.logger.warning("No TLE files found in directory")
                         return None
-                    filename = os.path.join(self.data_directory, sorted(files)[-1])
+                    filename = os.path.join(self.data_directory, newest)
                 except FileNotFoundError:
                     self.logger.error(f"Data directory not found: {self.data_directory}")
                     return None
@@ -157,28 +301,32 @@ class DataProcessor:
             cached_data = self.cache.get(cache_key)
             if cached_data is not None:
                 self.logger.info(f"Using cached satellite data for {filename}")
+                self._remember_dataset(cached_data, cache_key)
                 return cached_data
             
-            # Load TLE data
+            # Read TLE data line by line from a read-only memory map, without
+            # copying the whole file into one bytes object first
             satellites = []
-            with open(filename, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            # Process TLE data in groups of 3 lines
-            for i in range(0, len(lines), 3):
-                if i + 2 < len(lines):
-                    name = lines[i].strip()
-                    line1 = lines[i+1].strip()
-                    line2 = lines[i+2].strip()
-                    
-                    satellites.append({
-                        'name': name,
-                        'line1': line1,
-                        'line2': line2
-                    })
+            with open(filename, 'rb') as f:
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        # Drop blank lines so files with doubled line endings
+                        # keep the name/line1/line2 grouping aligned
+                        lines = (line for line in iter(mm.readline, b'') if line.strip())
+                        
+                        # Process TLE data in groups of 3 lines; TLE element
+                        # lines are plain ASCII, only the name line needs a
+                        # full utf-8 decode. An incomplete trailing group is
+                        # dropped
+                        for name, line1, line2 in zip(lines, lines, lines):
+                            satellites.append(SatelliteRecord(
+                                name.decode('utf-8', 'replace').strip(),
+                                line1.strip().decode('ascii', 'replace'),
+                                line2.strip().decode('ascii', 'replace')))
             
             # Cache the data
             self.cache.put(cache_key, satellites)
+            self._remember_dataset(satellites, cache_key)
             self.logger.info(f"Loaded {len(satellites)} satellites from {filename} and cached")
             return satellites
             
@@ -202,20 +350,14 @@ class DataProcessor:
             cached_result = self.cache.get(cache_key)
             if cached_result is not None:
                 self.logger.info("Using cached filtered satellite data")
+                self._remember_dataset(cached_result, cache_key)
                 return cached_result
             
-            filtered = []
-            for sat in satellites:
-                match = True
-                for key, value in criteria.items():
-                    if key in sat and sat[key] != value:
-                        match = False
-                        break
-                if match:
-                    filtered.append(sat)
+            filtered = list(self.ifilter_satellites(satellites, criteria))
             
             # Cache the result
             self.cache.put(cache_key, filtered)
+            self._remember_dataset(filtered, cache_key)
             self.logger.info(f"Filtered satellites: {len(satellites)} -> {len(filtered)}")
             return filtered
             
@@ -223,6 +365,79 @@ class DataProcessor:
             self.logger.error(f"Error filtering satellites: {e}")
             return satellites or []
     
+    def ifilter_satellites(self, satellites: Optional[Iterable[Mapping]],
+                           criteria: Optional[Dict[str, Any]] = None) -> Iterator[Mapping]:
+        """Lazily yield satellites matching all criteria, without caching.
+
+        A satellite that lacks a criterion's key is not excluded by it.
+        """
+        if not criteria:
+            return iter(satellites or ())
+        
+        cache_key = self._generate_cache_key("pred", criteria)
+        predicate = self.cache.get(cache_key)
+        if predicate is None:
+            predicate = self._compile_predicate(criteria)
+            self.cache.put(cache_key, predicate)
+        return filter(predicate, satellites or ())
+    
+    @staticmethod
+    def _compile_predicate(criteria: Dict[str, Any]):
+        """Compile criteria into a single lambda with the comparisons unrolled.
+
+        Keys and values are bound as globals of the generated code rather
+        than spliced in with repr, so any value type compares as it would
+        in the equivalent hand-written loop.
+        """
+        namespace: Dict[str, Any] = {'__builtins__': {}}
+        terms = []
+        for i, (key, value) in enumerate(criteria.items()):
+            namespace[f'k{i}'] = key
+            namespace[f'v{i}'] = value
+            terms.append(f"s.get(k{i}, v{i}) == v{i}")
+        return eval("lambda s: " + " and ".join(terms), namespace)
+    
+    def parse_orbital_elements(self, satellites: Optional[List[Mapping]]) -> np.ndarray:
+        """Parse numeric orbital elements from TLE line 2 into a structured array.
+
+        The result is index-aligned with ``satellites`` and uses
+        ``ORBITAL_ELEMENTS_DTYPE``. Entries whose line 2 is malformed get
+        ``norad_id`` -1 and NaN elements.
+        """
+        elements = np.empty(len(satellites or ()), dtype=ORBITAL_ELEMENTS_DTYPE)
+        if not satellites:
+            return elements
+        
+        line2 = [sat.get('line2', '') for sat in satellites]
+        valid = np.fromiter(
+            (line.startswith('2 ') and len(line) >= TLE_LINE_LENGTH for line in line2),
+            dtype=bool, count=len(line2)
+        )
+        elements['norad_id'] = -1
+        for name in ORBITAL_ELEMENTS_DTYPE.names[1:]:
+            elements[name] = np.nan
+        if not valid.any():
+            return elements
+        
+        # Slice every valid line to the fixed record length and reinterpret
+        # the packed bytes through the column layout in a single view
+        buffer = b''.join(line[:TLE_LINE_LENGTH].encode('ascii', 'replace')
+                          for line, ok in zip(line2, valid) if ok)
+        raw = np.frombuffer(buffer, dtype=_TLE_LINE2_RAW_DTYPE)
+        
+        parsed = elements[valid]
+        try:
+            parsed['norad_id'] = raw['norad_id'].astype(np.int32)
+            for name in ('inclination', 'raan', 'arg_perigee', 'mean_anomaly', 'mean_motion'):
+                parsed[name] = raw[name].astype(np.float64)
+            # Eccentricity is written with an implied leading decimal point
+            parsed['eccentricity'] = raw['eccentricity'].astype(np.int64) / 1e7
+        except ValueError as e:
+            self.logger.warning(f"Could not parse orbital elements: {e}")
+            return elements
+        elements[valid] = parsed
+        return elements
+    
     def export_to_csv(self, data: List[Dict[str, Any]], filename: str) -> bool:
         """Export satellite data to CSV format."""
         # Periodically cleanup expired cache entries
@@ -233,30 +448,108 @@ class DataProcessor:
             return False
             
         try:
-            # Check cache for export
-            cache_key = f"export_csv_{filename}"
-            cached_result = self.cache.get(cache_key)
-            if cached_result is not None and cached_result:
-                self.logger.info(f"Using cached CSV export for {filename}")
+            compress = self.export_config.get('compress_large_files', True)
+            target = self.compressed_filename(filename) if compress and len(data) > 1000 else filename
+            
+            # Reuse an identical export written earlier instead of re-serializing
+            cache_key = self._export_cache_key('csv', data, target != filename)
+            if cache_key is not None and self._reuse_export(cache_key, data, target):
+                self.logger.info(f"Using cached CSV export for {target}")
                 return True
             
-            compress = self.export_config.get('compress_large_files', True)
-            df = pd.DataFrame(data)
+            fieldnames = self._csv_fieldnames(data)
             if compress and len(data) > 1000:
                 # Compress large files
-                df.to_csv(filename + '.gz', index=False, compression='gzip')
-                self.logger.info(f"Exported {len(data)} records to {filename}.gz (compressed)")
+                with self._open_compressed(filename) as (raw, path):
+                    f = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+                    self._write_csv_rows(f, fieldnames, data)
+                    f.flush()
+                    f.detach()
+                self.logger.info(f"Exported {len(data)} records to {path} (compressed)")
             else:
-                df.to_csv(filename, index=False)
+                with open(filename, 'w', encoding='utf-8', newline='', buffering=1 << 20) as f:
+                    self._write_csv_rows(f, fieldnames, data)
                 self.logger.info(f"Exported {len(data)} records to {filename}")
             
             # Cache successful export
-            self.cache.put(cache_key, True)
+            if cache_key is not None:
+                self.cache.put(cache_key, (data, target))
             return True
         except Exception as e:
             self.logger.error(f"Failed to export to CSV: {e}")
             return False
     
+    def _remember_dataset(self, data: List[Any], cache_key: Any) -> None:
+        """Record the cache key a loaded or filtered list is stored under."""
+        self._dataset_keys[id(data)] = (data, cache_key)
+        self._dataset_keys.move_to_end(id(data))
+        while len(self._dataset_keys) > DATASET_KEYS_MAX:
+            self._dataset_keys.popitem(last=False)
+    
+    def _export_cache_key(self, fmt: str, data: List[Dict[str, Any]], compressed: bool) -> Optional[int]:
+        """Return the export memo key for ``data``, or None for lists of unknown origin.
+
+        Only lists returned by ``load_satellite_data`` or
+        ``filter_satellites`` are memoized; the key combines their dataset
+        cache key with the format and the compression codec.
+        """
+        entry = self._dataset_keys.get(id(data))
+        if entry is None or entry[0] is not data:
+            return None
+        codec = self._compression_codec() if compressed else None
+        return self._generate_cache_key(f"export_{fmt}", {'dataset': entry[1], 'compression': codec})
+    
+    def _reuse_export(self, cache_key: int, data: List[Dict[str, Any]], target: str) -> bool:
+        """Copy a previous export of the same list to ``target``.
+
+        The copied file is the earlier export byte for byte, so a JSON
+        export keeps the ``exported`` time of when it was first written.
+        """
+        previous = self.cache.get(cache_key)
+        if previous is None or previous[0] is not data or not os.path.exists(previous[1]):
+            return False
+        if os.path.abspath(previous[1]) != os.path.abspath(target):
+            shutil.copyfile(previous[1], target)
+        return True
+    
+    def compressed_filename(self, filename: str) -> str:
+        """Return the path a compressed export of ``filename`` is written to."""
+        return filename + ('.zst' if self._compression_codec() == 'zstd' else '.gz')
+    
+    def _compression_codec(self) -> str:
+        """Return the configured export codec, falling back to gzip without zstandard."""
+        codec = self.export_config.get('compression', 'zstd')
+        if codec == 'zstd' and not ZSTD_AVAILABLE:
+            return 'gzip'
+        return codec
+    
+    @contextmanager
+    def _open_compressed(self, filename: str):
+        """Open a binary stream compressing into ``filename`` plus the codec extension.
+
+        Yields ``(stream, path)``. zstd level 3 compresses about as well as
+        gzip -6 at a fraction of the CPU; gzip uses level 1 for speed.
+        """
+        path = self.compressed_filename(filename)
+        if self._compression_codec() == 'zstd':
+            compressor = zstandard.ZstdCompressor(level=3, threads=-1)
+            with open(path, 'wb') as raw, compressor.stream_writer(raw, closefd=False) as f:
+                yield f, path
+        else:
+            with gzip.open(path, 'wb', compresslevel=1) as f:
+                yield f, path
+    
+    @staticmethod
+    def _csv_fieldnames(data: List[Dict[str, Any]]) -> List[str]:
+        """Union of keys in first-seen order so rows with extra fields still get a column."""
+        return list(dict.fromkeys(key for row in data for key in row))
+    
+    def _write_csv_rows(self, f, fieldnames: List[str], data: List[Dict[str, Any]]) -> None:
+        """Write a header and all rows to an open text file."""
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(data)
+    
     def export_to_json(self, data: List[Dict[str, Any]], filename: str) -> bool:
         """Export satellite data to JSON format."""
         # Periodically cleanup expired cache entries
@@ -267,39 +560,78 @@ class DataProcessor:
             return False
             
         try:
-            # Check cache for export
-            cache_key = f"export_json_{filename}"
-            cached_result = self.cache.get(cache_key)
-            if cached_result is not None and cached_result:
-                self.logger.info(f"Using cached JSON export for {filename}")
+            compress = self.export_config.get('compress_large_files', True)
+            target = self.compressed_filename(filename) if compress and len(data) > 1000 else filename
+            
+            # Reuse an identical export written earlier instead of re-serializing
+            cache_key = self._export_cache_key('json', data, target != filename)
+            if cache_key is not None and self._reuse_export(cache_key, data, target):
+                self.logger.info(f"Using cached JSON export for {target}")
                 return True
             
-            compress = self.export_config.get('compress_large_files', True)
-            export_data = {
-                'satellites': data,
-                'exported': datetime.now().isoformat(),
-                'count': len(data),
-                'version': '1.0'
-            }
+            export_data = self._json_export_payload(data)
             
             if compress and len(data) > 1000:
                 # Compress large files
-                import gzip
-                with gzip.open(filename + '.gz', 'wt', encoding='utf-8') as f:
-                    json.dump(export_data, f, indent=2)
-                self.logger.info(f"Exported {len(data)} records to {filename}.gz (compressed)")
+                with self._open_compressed(filename) as (f, path):
+                    f.write(self._serialize_json(export_data))
+                self.logger.info(f"Exported {len(data)} records to {path} (compressed)")
             else:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(export_data, f, indent=2)
+                with open(filename, 'wb') as f:
+                    f.write(self._serialize_json(export_data))
                 self.logger.info(f"Exported {len(data)} records to {filename}")
             
             # Cache successful export
-            self.cache.put(cache_key, True)
+            if cache_key is not None:
+                self.cache.put(cache_key, (data, target))
             return True
         except Exception as e:
             self.logger.error(f"Failed to export to JSON: {e}")
             return False
     
+    @staticmethod
+    def _json_export_payload(data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Wrap records in the JSON export envelope."""
+        return {
+            'satellites': data,
+            'exported': datetime.now().isoformat(),
+            'count': len(data),
+            'version': '1.0'
+        }
+    
+    def export_json_bytes(self, data: List[Dict[str, Any]]) -> bytes:
+        """Serialize ``data`` in the JSON export format without touching disk."""
+        return self._serialize_json(self._json_export_payload(data))
+    
+    def export_csv_text(self, data: List[Dict[str, Any]]) -> str:
+        """Serialize ``data`` in the CSV export format without touching disk."""
+        return ''.join(self.iter_csv_chunks(data))
+    
+    def iter_csv_chunks(self, data: List[Dict[str, Any]], rows_per_chunk: int = 1000) -> Iterator[str]:
+        """Yield the CSV export of ``data`` in blocks of ``rows_per_chunk`` rows.
+        
+        Lets a streamed HTTP response send rows as they are written instead of
+        holding the whole document in memory.
+        """
+        buf = io.StringIO(newline='')
+        writer = csv.DictWriter(buf, fieldnames=self._csv_fieldnames(data))
+        writer.writeheader()
+        for start in range(0, len(data), rows_per_chunk):
+            writer.writerows(data[start:start + rows_per_chunk])
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+        if buf.tell():
+            # Header of an export without rows
+            yield buf.getvalue()
+    
+    def _serialize_json(self, export_data: Dict[str, Any]) -> bytes:
+        """Serialize export data to indented UTF-8 JSON, using orjson when available."""
+        # Mapping records such as SatelliteRecord are emitted as plain objects
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(export_data, option=orjson.OPT_INDENT_2, default=dict)
+        return json.dumps(export_data, indent=2, default=dict).encode('utf-8')
+    
     def analyze_constellation(self, satellites: Optional[List[Dict[str, str]]]) -> Dict[str, Any]:
         """Perform basic analysis on the satellite constellation."""
         if not satellites:
@@ -307,8 +639,15 @@ class DataProcessor:
             return {}
             
         try:
-            # Check cache for analysis
-            cache_key = f"analysis_{len(satellites) if satellites else 0}"
+            # Check cache for analysis, keyed on the names and element lines
+            # so that different constellations of the same size, or a TLE
+            # refresh that keeps the names, do not share an entry
+            tle_hash = hashlib.blake2b(digest_size=16)
+            for sat in satellites:
+                for field in ('name', 'line1', 'line2'):
+                    tle_hash.update(sat.get(field, '').encode())
+                    tle_hash.update(b'\x00')
+            cache_key = f"analysis_{tle_hash.hexdigest()}"
             cached_result = self.cache.get(cache_key)
             if cached_result is not None:
                 self.logger.info("Using cached constellation analysis")
@@ -320,25 +659,27 @@ class DataProcessor:
                 'analysis_date': datetime.now().isoformat()
             }
             
-            # Extract satellite IDs if possible
-            ids = []
-            for sat in satellites:
-                name = sat.get('name', '')
-                if '-' in name:
-                    try:
-                        # Try to extract numeric ID from name like "STARLINK-1234"
-                        id_part = name.split('-')[-1]
-                        if id_part.isdigit():
-                            ids.append(int(id_part))
-                    except Exception as e:
-                        self.logger.debug(f"Could not extract ID from satellite name {name}: {e}")
-                        pass
-            
-            if ids:
+            # Extract numeric IDs from names like "STARLINK-1234"
+            id_count, id_min, id_max = self._name_id_stats(
+                [sat.get('name', '') for sat in satellites])
+            if id_count:
                 stats['id_range'] = {
-                    'min': min(ids),
-                    'max': max(ids),
-                    'count': len(ids)
+                    'min': id_min,
+                    'max': id_max,
+                    'count': id_count
+                }
+            
+            # Summarise the orbital shells from the parsed line 2 elements
+            elements = self.parse_orbital_elements(satellites)
+            parsed = elements[elements['norad_id'] >= 0]
+            if len(parsed):
+                stats['orbital_elements'] = {
+                    'parsed': len(parsed),
+                    **{name: {
+                        'min': float(parsed[name].min()),
+                        'max': float(parsed[name].max()),
+                        'mean': float(parsed[name].mean()),
+                    } for name in ('inclination', 'eccentricity', 'mean_motion')}
                 }
             
             # Cache the analysis
@@ -350,6 +691,22 @@ class DataProcessor:
             self.logger.error(f"Error analyzing constellation: {e}")
             return {}
     
+    @staticmethod
+    def _name_id_stats(names: List[str]):
+        """Return (count, min, max) of the numeric suffixes in ``names``."""
+        if NUMBA_AVAILABLE:
+            encoded = [name.encode('utf-8') for name in names]
+            buf = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(name) for name in encoded], out=offsets[1:])
+            count, low, high = _name_id_stats(buf, offsets)
+            return int(count), int(low), int(high)
+        
+        ids = [int(match.group(1)) for match in map(_NAME_ID_RE.search, names) if match]
+        if not ids:
+            return 0, 0, 0
+        return len(ids), min(ids), max(ids)
+    
     def calculate_satellite_statistics(self, passes: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calculate statistics for satellite passes."""
         if not passes:
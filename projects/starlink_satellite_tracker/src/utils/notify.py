@@ -4,101 +4,442 @@ Notification system for Starlink Satellite Tracker
 Sends alerts about upcoming satellite passes via email or Telegram
 """
 
+import functools
+import hashlib
+import os
+import re
 import smtplib
+import sqlite3
 import ssl
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+from email.policy import SMTP as SMTP_POLICY
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Union
 
 # Import our configuration manager
 from utils.config_manager import get_config
 
-# Try to import telegram bot, but handle if not available
-try:
-    from telegram import Bot
-    TELEGRAM_AVAILABLE = True
-except ImportError:
-    TELEGRAM_AVAILABLE = False
-    Bot = None  # Define Bot as None to avoid undefined variable
-    logging.warning("python-telegram-bot not installed. Telegram notifications disabled.")
-
-# Try to import requests for Pushover, but handle if not available
+# Try to import requests for Telegram and Pushover, but handle if not available
 try:
     import requests
     PUSHOVER_AVAILABLE = True
 except ImportError:
     PUSHOVER_AVAILABLE = False
     requests = None  # Define requests as None to avoid undefined variable
-    logging.warning("requests not available. Pushover notifications disabled.")
+
+# Telegram is sent straight to the Bot API over the shared HTTP session
+TELEGRAM_AVAILABLE = PUSHOVER_AVAILABLE
+TELEGRAM_API_URL = "https://api.telegram.org/bot{token}/sendMessage"
+# Stay under the Bot API limit of about 30 messages per second per bot
+TELEGRAM_RATE_PER_SECOND = 25
+TELEGRAM_BURST = 30
+# Bot API limit on message text, in UTF-16 code units
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+
+# Message templates, parsed once and filled with str.format_map
+PASS_ALERT_TEMPLATE = """🚀 STARLINK SATELLITE PASS ALERT 🚀
+
+{body}
+
+Best viewing conditions expected!
+Look up and enjoy the show! 🌌
+"""
+PASS_DETAILS_TEMPLATE = """Satellite: {satellite}
+Time: {time}
+Maximum Elevation: {elevation:.1f}°
+Azimuth: {azimuth:.1f}°
+Brightness: {brightness:.1f} mag
+Velocity: {velocity:.2f} km/s"""
+PASS_DIGEST_TEMPLATE = "{count} upcoming passes:\n\n{details}"
+
+@functools.lru_cache(maxsize=4096)
+def _format_pass_time(pass_time: datetime, tzinfo) -> str:
+    """Format a whole-second pass time; ``tzinfo`` is part of the cache key.
+
+    Aware datetimes compare by instant, so without it the same instant in
+    two time zones would share one cached string.
+    """
+    return pass_time.strftime("%Y-%m-%d %H:%M:%S")
+
+
+# Number of recently notified passes remembered to suppress duplicates
+RECENT_NOTIFICATIONS_MAX = 1024
+
+# Relative data paths in the configuration are resolved against the
+# project root, so the web app and the CLI share one file whatever their
+# working directory
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# CRLF line endings for the wire; 7bit keeps non-ASCII bodies (emoji)
+# quoted-printable or base64 for servers without 8BITMIME
+EMAIL_POLICY = SMTP_POLICY.clone(cte_type='7bit')
+
+# Port for implicit TLS (SMTPS); other ports upgrade with STARTTLS
+SMTPS_PORT = 465
+
+@functools.lru_cache(maxsize=None)
+def _ssl_context() -> ssl.SSLContext:
+    """Return the shared client TLS context, loading the trust store once."""
+    return ssl.create_default_context()
+
+
+# Idle time after which a pooled SMTP session is probed with NOOP before reuse
+SMTP_IDLE_CHECK_SECONDS = 30
+
+# Channels already warned about a missing library, so each warning is
+# logged once per process and only when that channel is enabled
+_WARNED = set()
+
+
+class TokenBucket:
+    """Thread-safe token bucket that blocks callers to stay under a rate limit."""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self) -> None:
+        """Add the tokens earned since the last update. Call with ``_lock`` held."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def acquire(self) -> None:
+        """Take one token, sleeping until one is available."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+    
+    def pause(self, seconds: float) -> None:
+        """Withhold tokens for ``seconds``, e.g. to honour a server's retry_after."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0) - seconds * self.rate
+
+
+class SentNotificationStore:
+    """SQLite record of sent notification keys that expire after a TTL.
+
+    Lets duplicate suppression survive process restarts.
+    """
+    
+    def __init__(self, path: str, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS sent (key BLOB PRIMARY KEY, ts REAL)")
+        self._lock = threading.Lock()
+    
+    def contains(self, key: bytes) -> bool:
+        """Return whether ``key`` was recorded within the TTL."""
+        with self._lock:
+            row = self._conn.execute("SELECT ts FROM sent WHERE key = ?", (key,)).fetchone()
+        return row is not None and time.time() - row[0] < self.ttl_seconds
+    
+    def add(self, keys) -> None:
+        """Record ``keys`` as sent now and drop expired entries."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO sent (key, ts) VALUES (?, ?)",
+                                   [(key, now) for key in keys])
+            self._conn.execute("DELETE FROM sent WHERE ts < ?", (now - self.ttl_seconds,))
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
 
 
 class NotificationSystem:
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """Initialize notification system with configuration."""
+        self.logger = logging.getLogger(__name__)
+        
+        # Keep-alive HTTP session shared by HTTP-based channels and a
+        # lazily opened SMTP session reused across email sends
+        self._http = requests.Session() if requests is not None else None
+        self._smtp = None
+        self._smtp_lock = threading.Lock()
+        self._smtp_sent = 0
+        self._smtp_last_used = 0.0
+        self._tg_bucket = TokenBucket(TELEGRAM_RATE_PER_SECOND, TELEGRAM_BURST)
+        
+        # Bounded LRU of passes already notified, keyed on channel,
+        # satellite and pass minute, so re-predicted passes are not
+        # announced twice on a channel
+        self._recent = OrderedDict()
+        self._recent_lock = threading.Lock()
+        self._sent_store = None
+        
+        # Worker pool for fanning out channel sends, created on first use
+        # and kept for the lifetime of the notifier
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        
+        self.reload_config(config)
+    
+    def reload_config(self, config: Optional[Dict[str, Any]] = None) -> None:
+        """Load channel settings and precompute pass filters from configuration."""
         self.config = config or get_config()
         self.email_config = self.config.get('notifications', {}).get('email', {})
         self.telegram_config = self.config.get('notifications', {}).get('telegram', {})
         self.pushover_config = self.config.get('notifications', {}).get('pushover', {})
         self.notification_config = self.config.get('notifications', {})
-        self.logger = logging.getLogger(__name__)
         
-    def send_email_notification(self, subject: str, message: str, recipient: str) -> bool:
-        """Send email notification about satellite pass."""
-        if not self.email_config.get('enabled', False):
+        # Snapshot filter thresholds and compile name patterns once so that
+        # should_notify_for_pass does no config lookups per pass
+        self._min_elevation = self.notification_config.get('min_elevation', 10)
+        self._min_brightness = self.notification_config.get('min_brightness', -1)
+        self._min_velocity = self.notification_config.get('min_velocity', 0)
+        self._excluded_satellites = frozenset(self.notification_config.get('excluded_satellites', []))
+        self._included_satellites = frozenset(self.notification_config.get('included_satellites', []))
+        self._excluded_re = self._compile_patterns(self.notification_config.get('excluded_patterns', []))
+        self._included_re = self._compile_patterns(self.notification_config.get('included_patterns', []))
+        
+        # Likewise bind channel settings once so the send paths branch on
+        # attributes rather than looking up the config dicts per message
+        self._email_enabled = bool(self.email_config.get('enabled', False))
+        self._smtp_server = self.email_config.get('smtp_server')
+        self._smtp_port = self.email_config.get('smtp_port')
+        self._smtp_user = self.email_config.get('username')
+        self._smtp_pass = self.email_config.get('password')
+        self._smtp_max_messages = self.email_config.get('max_messages_per_connection', 100)
+        self._email_recipients = self._split_recipients(self.email_config.get('recipient', ''))
+        self._tg_enabled = bool(self.telegram_config.get('enabled', False))
+        self._tg_url = None
+        if self.telegram_config.get('bot_token'):
+            self._tg_url = TELEGRAM_API_URL.format(token=self.telegram_config['bot_token'])
+        self._tg_chat = self.telegram_config.get('chat_id')
+        self._pushover_enabled = bool(self.pushover_config.get('enabled', False))
+        self._pushover_user = self.pushover_config.get('user_key')
+        self._pushover_token = self.pushover_config.get('api_token')
+        
+        # An open SMTP session may point at the previous server or account
+        with self._smtp_lock:
+            self._close_smtp()
+        
+        self._warn_missing_libraries()
+        self._open_sent_store()
+    
+    def _open_sent_store(self) -> None:
+        """(Re)open the persistent record of sent notifications, if configured."""
+        if self._sent_store is not None:
+            self._sent_store.close()
+            self._sent_store = None
+        path = self.notification_config.get('sent_cache_path')
+        if not path:
+            return
+        if path != ':memory:' and not os.path.isabs(path):
+            path = os.path.join(PROJECT_ROOT, path)
+        try:
+            self._sent_store = SentNotificationStore(
+                path, self.notification_config.get('sent_cache_ttl_seconds', 7200))
+        except (sqlite3.Error, OSError) as e:
+            self.logger.warning("Could not open notification cache %s: %s", path, e)
+    
+    def _warn_missing_libraries(self) -> None:
+        """Warn once about enabled channels whose library is not installed."""
+        if not TELEGRAM_AVAILABLE and self._tg_enabled and 'telegram' not in _WARNED:
+            self.logger.warning("requests not available. Telegram notifications disabled.")
+            _WARNED.add('telegram')
+        if not PUSHOVER_AVAILABLE and self._pushover_enabled and 'pushover' not in _WARNED:
+            self.logger.warning("requests not available. Pushover notifications disabled.")
+            _WARNED.add('pushover')
+    
+    @staticmethod
+    def _compile_patterns(patterns) -> Optional[re.Pattern]:
+        """Compile substring patterns into a single alternation regex."""
+        if not patterns:
+            return None
+        return re.compile('|'.join(map(re.escape, patterns)))
+        
+    def send_email_notification(self, subject: str, message: str,
+                                recipient: Union[str, List[str]]) -> bool:
+        """Send email notification about satellite pass.
+
+        ``recipient`` may be a single address, a comma-separated string or a
+        list; all recipients are delivered in one SMTP transaction.
+        """
+        if not self._email_enabled:
             self.logger.info("Email notifications are disabled")
             return False
             
         try:
+            recipients = self._split_recipients(recipient)
+            
             # Validate inputs
-            if not subject or not message or not recipient:
+            if not subject or not message or not recipients:
                 self.logger.error("Invalid email parameters: subject, message, and recipient are required")
                 return False
                 
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = self.email_config.get('username', '')
-            msg['To'] = recipient
-            msg['Subject'] = subject
-            
-            msg.attach(MIMEText(message, 'plain'))
-            
             # Validate SMTP configuration
-            smtp_server = self.email_config.get('smtp_server')
-            smtp_port = self.email_config.get('smtp_port')
-            username = self.email_config.get('username')
-            password = self.email_config.get('password')
-            
-            if not smtp_server or not smtp_port or not username or not password:
+            username = self._smtp_user
+            if not self._smtp_server or not self._smtp_port or not username or not self._smtp_pass:
                 self.logger.error("Email configuration is incomplete")
                 return False
             
-            # Create SMTP session
-            server = smtplib.SMTP(smtp_server, smtp_port)
-            server.starttls(context=ssl.create_default_context())
-            server.login(username, password)
-            
-            # Send email
-            text = msg.as_string()
-            server.sendmail(username, recipient, text)
-            server.quit()
-            
-            self.logger.info(f"Email notification sent to {recipient}")
+            # Create a single-part message and serialise it straight to
+            # wire-format bytes, so sendmail does not re-encode a str
+            msg = EmailMessage(policy=EMAIL_POLICY)
+            msg['From'] = username
+            msg['To'] = ', '.join(recipients)
+            msg['Subject'] = subject
+            msg.set_content(message)
+            data = msg.as_bytes()
+            
+            # Send email over the shared SMTP session, reconnecting once if
+            # the server has dropped an idle connection
+            with self._smtp_lock:
+                try:
+                    for attempt in range(2):
+                        try:
+                            self._get_smtp().sendmail(username, recipients, data)
+                            break
+                        except smtplib.SMTPServerDisconnected:
+                            if attempt:
+                                raise
+                            self._smtp = None
+                except Exception:
+                    # Never keep a session that failed, including the
+                    # one opened for the retry
+                    self._close_smtp()
+                    raise
+                self._smtp_sent += 1
+                self._smtp_last_used = time.monotonic()
+            
+            self.logger.info("Email notification sent to %s", ', '.join(recipients))
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to send email notification: {e}")
+            self.logger.error("Failed to send email notification: %s", e)
             return False
     
+    @staticmethod
+    def _split_recipients(recipient: Union[str, List[str], None]) -> List[str]:
+        """Normalize a recipient string or list into a list of addresses."""
+        if not recipient:
+            return []
+        if isinstance(recipient, str):
+            recipient = recipient.split(',')
+        return [address.strip() for address in recipient if address and address.strip()]
+    
+    def _get_smtp(self) -> smtplib.SMTP:
+        """Return the authenticated SMTP session, opening it on first use.
+
+        Must be called with ``_smtp_lock`` held. The session is recycled
+        after ``max_messages_per_connection`` sends, and probed with NOOP
+        when it has been idle long enough for the server to drop it.
+        """
+        if self._smtp is not None:
+            if self._smtp_sent >= self._smtp_max_messages:
+                self._close_smtp()
+            elif (time.monotonic() - self._smtp_last_used > SMTP_IDLE_CHECK_SECONDS
+                  and not self._smtp_alive()):
+                self._smtp = None
+        
+        if self._smtp is None:
+            if int(self._smtp_port) == SMTPS_PORT:
+                server = smtplib.SMTP_SSL(self._smtp_server, self._smtp_port, context=_ssl_context())
+            else:
+                server = smtplib.SMTP(self._smtp_server, self._smtp_port)
+                server.starttls(context=_ssl_context())
+            server.login(self._smtp_user, self._smtp_pass)
+            self._smtp = server
+            self._smtp_sent = 0
+        return self._smtp
+    
+    def _smtp_alive(self) -> bool:
+        """Return whether the SMTP session still answers NOOP."""
+        try:
+            return self._smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+    
+    def _close_smtp(self) -> None:
+        """Quit and forget the SMTP session. Must be called with ``_smtp_lock`` held."""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception as e:
+                self.logger.debug("Error closing SMTP connection: %s", e)
+            self._smtp = None
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the shared send pool, creating it on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                # One worker per channel: email, Telegram and Pushover
+                self._executor = ThreadPoolExecutor(max_workers=3,
+                                                    thread_name_prefix='notify')
+            return self._executor
+    
+    def warm_up(self) -> None:
+        """Open connections for enabled channels ahead of the first alert.
+
+        Resolves and connects (and for SMTP, authenticates) up front so a
+        time-sensitive pass alert does not pay for DNS, TCP and TLS setup.
+        Failures are logged and left for the real send to retry.
+        """
+        if (self._email_enabled and self._smtp_server and self._smtp_port
+                and self._smtp_user and self._smtp_pass):
+            try:
+                with self._smtp_lock:
+                    self._get_smtp()
+                    self._smtp_last_used = time.monotonic()
+            except Exception as e:
+                self.logger.warning("SMTP warm-up failed: %s", e)
+        
+        if self._http is None:
+            return
+        hosts = []
+        if self._tg_enabled and self._tg_url:
+            hosts.append("https://api.telegram.org/")
+        if self._pushover_enabled:
+            hosts.append("https://api.pushover.net/")
+        for url in hosts:
+            try:
+                # Any response leaves a kept-alive connection in the pool
+                self._http.head(url, timeout=10)
+            except Exception as e:
+                self.logger.warning("Connection warm-up for %s failed: %s", url, e)
+    
+    def close(self) -> None:
+        """Release pooled SMTP and HTTP connections and the send pool."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        with self._smtp_lock:
+            self._close_smtp()
+        if self._http is not None:
+            self._http.close()
+        if self._sent_store is not None:
+            self._sent_store.close()
+            self._sent_store = None
+    
     def send_telegram_notification(self, message: str) -> bool:
         """Send Telegram notification about satellite pass."""
-        if not self.telegram_config.get('enabled', False):
+        if not self._tg_enabled:
             self.logger.info("Telegram notifications are disabled")
             return False
             
         if not TELEGRAM_AVAILABLE:
-            self.logger.warning("Telegram library not available")
+            self.logger.warning("Requests library not available for Telegram")
             return False
             
         try:
@@ -108,29 +449,77 @@ class NotificationSystem:
                 return False
                 
             # Validate Telegram configuration
-            bot_token = self.telegram_config.get('bot_token')
-            chat_id = self.telegram_config.get('chat_id')
-            
-            if not bot_token or not chat_id:
+            if not self._tg_url or not self._tg_chat:
                 self.logger.error("Telegram configuration is incomplete")
                 return False
             
-            if Bot is not None:
-                bot = Bot(token=bot_token)
-                bot.send_message(chat_id=chat_id, text=message)
+            # Post to the Bot API over the keep-alive session so repeated
+            # notifications skip the TCP and TLS handshakes
+            if self._http is not None:
+                # A digest normally fits one message; longer ones are split
+                # between passes rather than rejected by the API
+                for part in self._split_message(message, TELEGRAM_MAX_MESSAGE_LENGTH):
+                    response = self._post_telegram(part)
+                    if response.status_code != 200:
+                        self.logger.error("Failed to send Telegram notification: %s", response.text)
+                        return False
                 self.logger.info("Telegram notification sent")
                 return True
             else:
-                self.logger.warning("Telegram Bot is not available")
+                self.logger.error("Requests library not available for Telegram notification")
                 return False
             
         except Exception as e:
-            self.logger.error(f"Failed to send Telegram notification: {e}")
+            self.logger.error("Failed to send Telegram notification: %s", e)
             return False
     
+    def _post_telegram(self, text: str):
+        """POST one sendMessage call, honouring the rate limit and one 429 retry."""
+        payload = {'chat_id': self._tg_chat, 'text': text}
+        self._tg_bucket.acquire()
+        response = self._http.post(self._tg_url, json=payload, timeout=10)
+        if response.status_code == 429:
+            # Rate limited: hold back all Telegram sends for the
+            # requested time, then retry once
+            retry_after = response.json().get('parameters', {}).get('retry_after', 1)
+            self.logger.warning("Telegram rate limit hit, retrying in %ss", retry_after)
+            self._tg_bucket.pause(retry_after)
+            self._tg_bucket.acquire()
+            response = self._http.post(self._tg_url, json=payload, timeout=10)
+        return response
+    
+    @staticmethod
+    def _split_message(message: str, limit: int) -> List[str]:
+        """Split ``message`` at blank lines into parts of at most ``limit`` UTF-16 units."""
+        def length(text):
+            return len(text.encode('utf-16-le')) // 2
+        
+        if length(message) <= limit:
+            return [message]
+        
+        parts, current = [], ''
+        for paragraph in message.split('\n\n'):
+            candidate = f"{current}\n\n{paragraph}" if current else paragraph
+            if length(candidate) <= limit:
+                current = candidate
+                continue
+            if current:
+                parts.append(current)
+            # A single oversized paragraph is cut at the limit
+            while length(paragraph) > limit:
+                cut = limit
+                while length(paragraph[:cut]) > limit:
+                    cut -= 1
+                parts.append(paragraph[:cut])
+                paragraph = paragraph[cut:]
+            current = paragraph
+        if current:
+            parts.append(current)
+        return parts
+    
     def send_pushover_notification(self, message: str, title: str = "Starlink Tracker") -> bool:
         """Send Pushover notification about satellite pass."""
-        if not self.pushover_config.get('enabled', False):
+        if not self._pushover_enabled:
             self.logger.info("Pushover notifications are disabled")
             return False
             
@@ -145,8 +534,8 @@ class NotificationSystem:
                 return False
                 
             # Validate Pushover configuration
-            user_key = self.pushover_config.get('user_key')
-            api_token = self.pushover_config.get('api_token')
+            user_key = self._pushover_user
+            api_token = self._pushover_token
             
             if not user_key or not api_token:
                 self.logger.error("Pushover configuration is incomplete")
@@ -161,20 +550,20 @@ class NotificationSystem:
                 "title": title
             }
             
-            if requests is not None:
-                response = requests.post(pushover_url, data=data)
+            if self._http is not None:
+                response = self._http.post(pushover_url, data=data)
                 if response.status_code == 200:
                     self.logger.info("Pushover notification sent")
                     return True
                 else:
-                    self.logger.error(f"Failed to send Pushover notification: {response.text}")
+                    self.logger.error("Failed to send Pushover notification: %s", response.text)
                     return False
             else:
                 self.logger.error("Requests library not available for Pushover notification")
                 return False
                 
         except Exception as e:
-            self.logger.error(f"Failed to send Pushover notification: {e}")
+            self.logger.error("Failed to send Pushover notification: %s", e)
             return False
     
     def should_notify_for_pass(self, satellite_name: str, max_elevation: float, 
@@ -182,59 +571,51 @@ class NotificationSystem:
         """Determine if a notification should be sent for a satellite pass based on filters."""
         try:
             # Check minimum elevation
-            min_elevation = self.notification_config.get('min_elevation', 10)
-            if max_elevation < min_elevation:
-                self.logger.debug(f"Skipping notification for {satellite_name}: Elevation {max_elevation}° below minimum {min_elevation}°")
+            if max_elevation < self._min_elevation:
+                self.logger.debug("Skipping notification for %s: Elevation %s° below minimum %s°",
+                                  satellite_name, max_elevation, self._min_elevation)
                 return False
             
             # Check minimum brightness (if provided)
-            min_brightness = self.notification_config.get('min_brightness', -1)
-            if brightness < min_brightness:
-                self.logger.debug(f"Skipping notification for {satellite_name}: Brightness {brightness} below minimum {min_brightness}")
+            if brightness < self._min_brightness:
+                self.logger.debug("Skipping notification for %s: Brightness %s below minimum %s",
+                                  satellite_name, brightness, self._min_brightness)
                 return False
             
             # Check minimum velocity (if provided)
-            min_velocity = self.notification_config.get('min_velocity', 0)
-            if velocity > 0 and velocity < min_velocity:
-                self.logger.debug(f"Skipping notification for {satellite_name}: Velocity {velocity} km/s below minimum {min_velocity} km/s")
+            if velocity > 0 and velocity < self._min_velocity:
+                self.logger.debug("Skipping notification for %s: Velocity %s km/s below minimum %s km/s",
+                                  satellite_name, velocity, self._min_velocity)
                 return False
             
             # Check satellite name filters
-            excluded_satellites = self.notification_config.get('excluded_satellites', [])
-            if satellite_name in excluded_satellites:
-                self.logger.debug(f"Skipping notification for {satellite_name}: Satellite is excluded")
+            if satellite_name in self._excluded_satellites:
+                self.logger.debug("Skipping notification for %s: Satellite is excluded", satellite_name)
                 return False
             
             # Check satellite name patterns
-            excluded_patterns = self.notification_config.get('excluded_patterns', [])
-            for pattern in excluded_patterns:
-                if pattern in satellite_name:
-                    self.logger.debug(f"Skipping notification for {satellite_name}: Matches excluded pattern '{pattern}'")
+            if self._excluded_re is not None:
+                match = self._excluded_re.search(satellite_name)
+                if match:
+                    self.logger.debug("Skipping notification for %s: Matches excluded pattern '%s'",
+                                      satellite_name, match.group(0))
                     return False
             
             # Check for specific included satellites (if specified)
-            included_satellites = self.notification_config.get('included_satellites', [])
-            if included_satellites and satellite_name not in included_satellites:
-                self.logger.debug(f"Skipping notification for {satellite_name}: Satellite not in included list")
+            if self._included_satellites and satellite_name not in self._included_satellites:
+                self.logger.debug("Skipping notification for %s: Satellite not in included list", satellite_name)
                 return False
             
             # Check for specific included patterns (if specified)
-            included_patterns = self.notification_config.get('included_patterns', [])
-            if included_patterns:
-                pattern_match = False
-                for pattern in included_patterns:
-                    if pattern in satellite_name:
-                        pattern_match = True
-                        break
-                if not pattern_match:
-                    self.logger.debug(f"Skipping notification for {satellite_name}: Does not match any included pattern")
-                    return False
+            if self._included_re is not None and not self._included_re.search(satellite_name):
+                self.logger.debug("Skipping notification for %s: Does not match any included pattern", satellite_name)
+                return False
             
             # All filters passed
             return True
             
         except Exception as e:
-            self.logger.error(f"Error checking notification filters for {satellite_name}: {e}")
+            self.logger.error("Error checking notification filters for %s: %s", satellite_name, e)
             # If there's an error in filtering, default to allowing notifications
             return True
     
@@ -249,58 +630,203 @@ class NotificationSystem:
             
             # Check if we should notify based on filters
             if not self.should_notify_for_pass(satellite_name, max_elevation, brightness, velocity):
-                self.logger.info(f"Skipping notification for {satellite_name} based on filters")
+                self.logger.info("Skipping notification for %s based on filters", satellite_name)
                 return True  # Not an error, just filtered out
             
+            channels = self._channels()
+            if not channels:
+                self.logger.warning("No notification channels enabled for %s", satellite_name)
+                return False
+            
+            # Skip channels that already announced this pass
+            keys = {channel: self._pass_key(satellite_name, pass_time, channel) for channel in channels}
+            claimed = self._claim_keys(keys.values())
+            pending = [channel for channel in channels if keys[channel] in claimed]
+            if not pending:
+                self.logger.info("Skipping duplicate notification for %s", satellite_name)
+                return True
+            
             # Format message
-            time_str = pass_time.strftime("%Y-%m-%d %H:%M:%S")
-            message = f"""🚀 STARLINK SATELLITE PASS ALERT 🚀
-
-Satellite: {satellite_name}
-Time: {time_str}
-Maximum Elevation: {max_elevation:.1f}°
-Azimuth: {azimuth:.1f}°
-Brightness: {brightness:.1f} mag
-Velocity: {velocity:.2f} km/s
+            message = PASS_ALERT_TEMPLATE.format_map({'body': self._format_pass_details(
+                satellite_name, pass_time, max_elevation, azimuth, brightness, velocity)})
+            
+            success = self._settle(self._dispatch({channel: message for channel in pending}),
+                                   {channel: [keys[channel]] for channel in pending})
+            if success:
+                self.logger.info("Notification sent successfully for %s", satellite_name)
+            else:
+                self.logger.warning("Some notifications failed for %s", satellite_name)
+                
+            return success
+            
+        except Exception as e:
+            self.logger.error("Error sending notification for %s: %s", satellite_name, e)
+            return False
+    
+    def notify_upcoming_passes(self, passes: List[Dict[str, Any]]) -> bool:
+        """Send one digest notification covering several upcoming passes.
 
-Best viewing conditions expected!
-Look up and enjoy the show! 🌌
-"""
+        ``passes`` are pass dicts as returned by ``StarlinkTracker.predict_passes``
+        (``satellite``, ``time``, ``altitude``, ``azimuth`` and optionally
+        ``brightness`` and ``velocity``). Passes rejected by the filters are
+        left out; each channel receives a single message for the rest.
+        """
+        try:
+            due = [dict(p, satellite=p.get('satellite') or 'Unknown') for p in passes if p.get('time')]
+            due = [p for p in due
+                   if self.should_notify_for_pass(p['satellite'], p.get('altitude', 0),
+                                                  p.get('brightness', 0), p.get('velocity', 0))]
+            if not due:
+                self.logger.info("No passes to notify about after filtering")
+                return True  # Not an error, just filtered out
             
-            # Send notifications based on configuration
-            success = True
-            
-            if self.email_config.get('enabled', False):
-                recipient = self.email_config.get('recipient', '')
-                if recipient:
-                    email_success = self.send_email_notification(
-                        "Starlink Satellite Pass Alert", 
-                        message, 
-                        recipient
-                    )
-                    success = success and email_success
-                else:
-                    self.logger.warning("Email recipient not configured")
+            channels = self._channels()
+            if not channels:
+                self.logger.warning("No notification channels enabled for %d passes", len(due))
+                return False
             
-            if self.telegram_config.get('enabled', False):
-                telegram_success = self.send_telegram_notification(message)
-                success = success and telegram_success
+            # Leave out passes a channel already announced; each key is
+            # hashed once and reused for the claim and the filter
+            pass_keys = [{channel: self._pass_key(p['satellite'], p['time'], channel) for channel in channels}
+                         for p in due]
+            claimed = self._claim_keys([key for keys in pass_keys for key in keys.values()])
+            pending = {}
+            for channel in channels:
+                indices = tuple(i for i, keys in enumerate(pass_keys) if keys[channel] in claimed)
+                if indices:
+                    pending[channel] = indices
+            if not pending:
+                self.logger.info("All passes were already notified")
+                return True
             
-            if self.pushover_config.get('enabled', False):
-                pushover_success = self.send_pushover_notification(message, "Starlink Satellite Pass")
-                success = success and pushover_success
+            # Channels normally share the same passes, so each distinct
+            # selection is formatted once
+            format_details = self._format_pass_details
+            details = {}
+            bodies = {}
+            for indices in pending.values():
+                if indices in bodies:
+                    continue
+                for i in indices:
+                    if i not in details:
+                        p = due[i]
+                        details[i] = format_details(p['satellite'], p['time'], p.get('altitude', 0),
+                                                    p.get('azimuth', 0), p.get('brightness', 0),
+                                                    p.get('velocity', 0))
+                if len(indices) == 1:
+                    body = details[indices[0]]
+                else:
+                    body = PASS_DIGEST_TEMPLATE.format_map({
+                        'count': len(indices), 'details': "\n\n".join(details[i] for i in indices)})
+                bodies[indices] = PASS_ALERT_TEMPLATE.format_map({'body': body})
             
+            success = self._settle(
+                self._dispatch({channel: bodies[indices] for channel, indices in pending.items()}),
+                {channel: [pass_keys[i][channel] for i in indices] for channel, indices in pending.items()})
             if success:
-                self.logger.info(f"Notification sent successfully for {satellite_name}")
+                self.logger.info("Notification sent for %d passes", len(details))
             else:
-                self.logger.warning(f"Some notifications failed for {satellite_name}")
-                
+                self.logger.warning("Some notifications failed for %d passes", len(details))
             return success
             
         except Exception as e:
-            self.logger.error(f"Error sending notification for {satellite_name}: {e}")
+            self.logger.error("Error sending digest notification: %s", e)
             return False
+    
+    @staticmethod
+    def _pass_key(satellite_name: str, pass_time: datetime, channel: str) -> bytes:
+        """Return the dedup key for a pass on a channel: satellite name and pass minute."""
+        minute = int(pass_time.timestamp()) // 60
+        return hashlib.blake2b(f"{channel}|{satellite_name}|{minute}".encode(), digest_size=8).digest()
+    
+    def _claim_keys(self, keys) -> set:
+        """Record pass keys as notified and return the ones that were new."""
+        claimed = set()
+        with self._recent_lock:
+            for key in keys:
+                if key in self._recent:
+                    self._recent.move_to_end(key)
+                    continue
+                if self._sent_store is not None and self._sent_store.contains(key):
+                    continue
+                self._recent[key] = None
+                claimed.add(key)
+            while len(self._recent) > RECENT_NOTIFICATIONS_MAX:
+                self._recent.popitem(last=False)
+        return claimed
+    
+    def _confirm_passes(self, keys) -> None:
+        """Persist successfully notified passes so restarts do not resend them."""
+        if self._sent_store is not None and keys:
+            try:
+                self._sent_store.add(keys)
+            except sqlite3.Error as e:
+                self.logger.warning("Could not record sent notifications: %s", e)
+    
+    def _release_passes(self, keys) -> None:
+        """Forget claimed passes after a failed send so they can be retried."""
+        with self._recent_lock:
+            for key in keys:
+                self._recent.pop(key, None)
+    
+    def _settle(self, results: Dict[str, bool], channel_keys: Dict[str, List[bytes]]) -> bool:
+        """Confirm the keys of channels that delivered, release the rest.
 
+        Returns whether every attempted channel delivered; a retry then
+        only resends on the channels that failed.
+        """
+        delivered = [key for channel, ok in results.items() if ok for key in channel_keys[channel]]
+        failed = [key for channel, ok in results.items() if not ok for key in channel_keys[channel]]
+        self._confirm_passes(delivered)
+        self._release_passes(failed)
+        return bool(results) and not failed
+    
+    @staticmethod
+    def _format_pass_details(satellite_name: str, pass_time: datetime, max_elevation: float,
+                             azimuth: float, brightness: float, velocity: float) -> str:
+        """Format the per-pass lines shared by single and digest messages."""
+        return PASS_DETAILS_TEMPLATE.format_map({
+            'satellite': satellite_name,
+            'time': _format_pass_time(pass_time.replace(microsecond=0), pass_time.tzinfo),
+            'elevation': max_elevation,
+            'azimuth': azimuth,
+            'brightness': brightness,
+            'velocity': velocity,
+        })
+    
+    def _channels(self) -> List[str]:
+        """Return the enabled channels that have enough settings to send."""
+        channels = []
+        if self._email_enabled:
+            if self._email_recipients:
+                channels.append('email')
+            else:
+                self.logger.warning("Email recipient not configured")
+        if self._tg_enabled:
+            channels.append('telegram')
+        if self._pushover_enabled:
+            channels.append('pushover')
+        return channels
+    
+    def _send_on(self, channel: str, message: str) -> bool:
+        """Send ``message`` on one channel."""
+        if channel == 'email':
+            return self.send_email_notification("Starlink Satellite Pass Alert", message,
+                                                self._email_recipients)
+        if channel == 'telegram':
+            return self.send_telegram_notification(message)
+        return self.send_pushover_notification(message, "Starlink Satellite Pass")
+    
+    def _dispatch(self, messages: Dict[str, str]) -> Dict[str, bool]:
+        """Send each channel its message and return whether each one succeeded."""
+        # Channels are independent network round trips, so run them
+        # concurrently and wait for the slowest instead of their sum
+        if len(messages) > 1:
+            executor = self._get_executor()
+            futures = {channel: executor.submit(self._send_on, channel, message)
+                       for channel, message in messages.items()}
+            return {channel: future.result() for channel, future in futures.items()}
+        return {channel: self._send_on(channel, message) for channel, message in messages.items()}
 
 def create_notification_example():
     """Create an example of how to use the notification system."""
@@ -4,34 +4,66 @@ Scheduler utility for Starlink Satellite Tracker
 Handles automated tasks based on cron-like schedules defined in config.json
 """
 
-import schedule
+import atexit
+import heapq
+import itertools
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import logging
-from datetime import datetime
-import json
-import os
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional
 
 # Import our configuration manager
 from utils.config_manager import get_config
 
+# Try to import croniter for exact cron semantics, but fall back to the
+# built-in interval mapping
+try:
+    from croniter import croniter
+    CRONITER_AVAILABLE = True
+except ImportError:
+    CRONITER_AVAILABLE = False
+    croniter = None  # Define croniter as None to avoid undefined variable
+
+# Older configs used "0 0 */6 * *" to mean every 6 hours; in standard cron it
+# means midnight on every sixth day of the month
+LEGACY_CRON_ALIASES = {
+    '0 0 */6 * *': '0 */6 * * *',
+}
+
+# Fixed intervals for the common expressions when croniter is not installed
+FALLBACK_INTERVALS = {
+    '0 */6 * * *': timedelta(hours=6),
+    '*/30 * * * *': timedelta(minutes=30),
+    '*/15 * * * *': timedelta(minutes=15),
+    '0 * * * *': timedelta(hours=1),
+}
+
+# Back-off after scheduler loop errors: starts at the minimum, doubles with
+# each consecutive failure and resets once the loop runs cleanly
+ERROR_BACKOFF_MIN_SECONDS = 10
+ERROR_BACKOFF_MAX_SECONDS = 300
+
+# Module logger for the static cron helpers, which have no self.logger
+logger = logging.getLogger(__name__)
+
 
 class JobExecutionCache:
     """Cache for tracking job execution times to prevent duplicate runs."""
     
     def __init__(self):
-        self.execution_times = {}
+        # Monotonic timestamps, unaffected by wall-clock adjustments
+        self.execution_times: Dict[str, float] = {}
         self.logger = logging.getLogger(__name__)
     
     def should_execute(self, job_name: str, min_interval_seconds: int = 60) -> bool:
         """Check if job should be executed based on last execution time."""
-        now = datetime.now()
-        if job_name in self.execution_times:
-            elapsed = (now - self.execution_times[job_name]).total_seconds()
-            if elapsed < min_interval_seconds:
-                self.logger.debug(f"Skipping {job_name}, last executed {elapsed:.1f}s ago")
-                return False
+        now = time.monotonic()
+        last = self.execution_times.get(job_name)
+        if last is not None and now - last < min_interval_seconds:
+            self.logger.debug("Skipping %s, last executed %.1fs ago", job_name, now - last)
+            return False
         
         # Update execution time
         self.execution_times[job_name] = now
@@ -69,68 +101,65 @@ class CronParser:
                 'weekday': parts[4]
             }
         except Exception as e:
-            logging.error(f"Error parsing cron expression '{cron_expression}': {e}")
+            logger.error("Error parsing cron expression '%s': %s", cron_expression, e)
             raise
     
     @staticmethod
-    def cron_to_schedule_job(cron_expression: str, job_function, job_tag: str) -> bool:
+    def next_run_time(cron_expression: str, after: datetime) -> Optional[datetime]:
         """
-        Convert a cron expression to a schedule job.
+        Compute when a job with the given cron expression should next run.
+        
+        Uses croniter when installed; otherwise common expressions are
+        mapped to fixed intervals.
         
         Args:
             cron_expression: A cron expression
-            job_function: The function to schedule
-            job_tag: Tag for the job
+            after: The time to schedule from
             
         Returns:
-            True if successful, False otherwise
+            The next run time, or None if the expression is invalid
         """
         try:
             parts = cron_expression.strip().split()
             if len(parts) != 5:
-                logging.warning(f"Invalid cron expression: {cron_expression}")
-                return False
+                logger.warning("Invalid cron expression: %s", cron_expression)
+                return None
+            
+            cron_expression = ' '.join(parts)
+            cron_expression = LEGACY_CRON_ALIASES.get(cron_expression, cron_expression)
             
-            minute, hour, day, month, weekday = parts
+            if CRONITER_AVAILABLE:
+                if not croniter.is_valid(cron_expression):
+                    logger.warning("Invalid cron expression: %s", cron_expression)
+                    return None
+                return croniter(cron_expression, after).get_next(datetime)
             
-            # Handle special cases
-            if cron_expression == '0 0 */6 * *':
-                # Every 6 hours
-                schedule.every(6).hours.do(job_function).tag(job_tag)
-            elif cron_expression == '*/30 * * * *':
-                # Every 30 minutes
-                schedule.every(30).minutes.do(job_function).tag(job_tag)
-            elif cron_expression == '*/15 * * * *':
-                # Every 15 minutes
-                schedule.every(15).minutes.do(job_function).tag(job_tag)
-            elif cron_expression == '0 0 * * *':
+            # Handle special cases with a table lookup
+            interval = FALLBACK_INTERVALS.get(cron_expression)
+            if interval is not None:
+                return after + interval
+            if cron_expression == '0 0 * * *':
                 # Daily at midnight
-                schedule.every().day.at("00:00").do(job_function).tag(job_tag)
-            elif cron_expression == '0 * * * *':
-                # Hourly
-                schedule.every().hour.do(job_function).tag(job_tag)
-            else:
-                # Try to parse more complex expressions
-                if CronParser._is_simple_interval(minute, hour):
-                    # Simple interval like "*/N * * * *"
-                    if minute.startswith('*/') and hour == '*':
-                        try:
-                            interval = int(minute[2:])
-                            if interval > 0:
-                                schedule.every(interval).minutes.do(job_function).tag(job_tag)
-                                return True
-                        except ValueError:
-                            pass
-                
-                # Fall back to basic scheduling if we can't parse
-                logging.warning(f"Unsupported cron expression '{cron_expression}', using default 1 hour interval")
-                schedule.every().hour.do(job_function).tag(job_tag)
+                return datetime.combine(after.date() + timedelta(days=1), datetime.min.time())
             
-            return True
+            # Try to parse more complex expressions
+            minute, hour = cron_expression.split()[:2]
+            if CronParser._is_simple_interval(minute, hour):
+                # Simple interval like "*/N * * * *"
+                try:
+                    interval = int(minute[2:])
+                    if interval > 0:
+                        return after + timedelta(minutes=interval)
+                except ValueError:
+                    pass
+            
+            # Fall back to basic scheduling if we can't parse
+            logger.warning("Unsupported cron expression '%s', using default 1 hour interval", cron_expression)
+            return after + timedelta(hours=1)
             
         except Exception as e:
-            logging.error(f"Error converting cron expression '{cron_expression}' to schedule job: {e}")
-            return False
+            logger.error("Error computing next run for cron expression '%s': %s", cron_expression, e)
+            return None
     
     @staticmethod
     def _is_simple_interval(minute: str, hour: str) -> bool:
@@ -138,6 +167,16 @@ class CronParser:
         return minute.startswith('*/') and hour == '*'
 
 
+class ScheduledJob:
+    """A named task together with its cron expression and next run time."""
+    
+    def __init__(self, name: str, cron_expression: str, function):
+        self.name = name
+        self.cron_expression = cron_expression
+        self.function = function
+        self.next_run: Optional[datetime] = None
+
+
 class StarlinkScheduler:
     def __init__(self, config: Optional[Dict[str, Any]] = None, tracker=None):
         """Initialize scheduler with configuration and tracker instance."""
@@ -147,59 +186,117 @@ class StarlinkScheduler:
         self.running = False
         self.thread = None
         
-        # Setup logging
+        # Logging is configured by the entry point (web app, CLI or main())
         self.logger = logging.getLogger(__name__)
-        logging.basicConfig(level=logging.INFO, 
-                          format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         
         # Initialize execution cache
         self.execution_cache = JobExecutionCache()
+        
+        # Min-heap of (monotonic run time, sequence, job). The loop sleeps
+        # until the earliest entry is due; _wakeup interrupts the sleep when
+        # jobs change or the scheduler stops
+        self._jobs = []
+        self._job_registry: Dict[str, ScheduledJob] = {}
+        self._jobs_lock = threading.Lock()
+        self._job_sequence = itertools.count()
+        self._wakeup = threading.Event()
+        # Set to stop the loop thread; each start gets a fresh event so a
+        # previous loop that has not exited yet cannot resume after restart
+        self._stop_event = threading.Event()
+        
+        # Notifier kept across notification checks so its SMTP and HTTP
+        # connections are reused; created on first use
+        self._notifier = None
+        # Single background worker that delivers notifications so network
+        # round trips do not hold up the scheduler loop; keeps digests ordered
+        self._notify_executor = None
+        
+        # Workers that run due jobs so a slow TLE download neither delays
+        # other jobs nor keeps the loop from going back to sleep; a job is
+        # not started again while its previous run is still in progress, so
+        # one worker per registered job means no job ever queues behind another
+        self._job_executor = None
+        self._running_jobs = set()
     
     def setup_scheduled_tasks(self) -> bool:
         """Setup all scheduled tasks based on configuration."""
         try:
             # Clear any existing scheduled jobs first
-            schedule.clear()
+            self._clear_jobs()
             
             # Debug logging
-            self.logger.debug(f"Schedule config: {self.schedule_config}")
-            self.logger.debug(f"Schedule config type: {type(self.schedule_config)}")
-            self.logger.debug(f"Schedule config length: {len(self.schedule_config) if self.schedule_config else 'N/A'}")
+            self.logger.debug("Schedule config: %s", self.schedule_config)
+            self.logger.debug("Schedule config type: %s", type(self.schedule_config))
+            self.logger.debug("Schedule config length: %s", len(self.schedule_config) if self.schedule_config else 'N/A')
             
             if not self.schedule_config or not isinstance(self.schedule_config, dict) or len(self.schedule_config) == 0:
                 self.logger.warning("No schedule configuration found")
                 return False
             
             # Setup TLE update task
-            tle_cron = self.schedule_config.get('tle_update_cron', '0 0 */6 * *')
+            tle_cron = self.schedule_config.get('tle_update_cron', '0 */6 * * *')
             if tle_cron:
-                if not CronParser.cron_to_schedule_job(tle_cron, self._update_tle_data, "TLE Update"):
-                    self.logger.warning(f"Failed to schedule TLE update with cron: {tle_cron}")
+                if not self._add_job("TLE Update", tle_cron, self._update_tle_data):
+                    self.logger.warning("Failed to schedule TLE update with cron: %s", tle_cron)
                 else:
-                    self.logger.info(f"Scheduled TLE Update with cron: {tle_cron}")
+                    self.logger.info("Scheduled TLE Update with cron: %s", tle_cron)
             
             # Setup prediction update task
             pred_cron = self.schedule_config.get('prediction_update_cron', '*/30 * * * *')
             if pred_cron:
-                if not CronParser.cron_to_schedule_job(pred_cron, self._update_predictions, "Prediction Update"):
-                    self.logger.warning(f"Failed to schedule Prediction Update with cron: {pred_cron}")
+                if not self._add_job("Prediction Update", pred_cron, self._update_predictions):
+                    self.logger.warning("Failed to schedule Prediction Update with cron: %s", pred_cron)
                 else:
-                    self.logger.info(f"Scheduled Prediction Update with cron: {pred_cron}")
+                    self.logger.info("Scheduled Prediction Update with cron: %s", pred_cron)
             
             # Setup notification check task
             notif_cron = self.schedule_config.get('notification_check_cron', '*/15 * * * *')
             if notif_cron:
-                if not CronParser.cron_to_schedule_job(notif_cron, self._check_notifications, "Notification Check"):
-                    self.logger.warning(f"Failed to schedule Notification Check with cron: {notif_cron}")
+                if not self._add_job("Notification Check", notif_cron, self._check_notifications):
+                    self.logger.warning("Failed to schedule Notification Check with cron: %s", notif_cron)
                 else:
-                    self.logger.info(f"Scheduled Notification Check with cron: {notif_cron}")
+                    self.logger.info("Scheduled Notification Check with cron: %s", notif_cron)
             
             self.logger.info("Scheduled tasks setup completed")
             return True
             
         except Exception as e:
-            self.logger.error(f"Error setting up scheduled tasks: {e}")
+            self.logger.error("Error setting up scheduled tasks: %s", e)
+            return False
+    
+    def _add_job(self, name: str, cron_expression: str, function) -> bool:
+        """Register a job and schedule its first run. Returns False for invalid cron."""
+        job = ScheduledJob(name, cron_expression, function)
+        with self._jobs_lock:
+            self._job_registry[name] = job
+        if not self._schedule_job(job):
+            with self._jobs_lock:
+                del self._job_registry[name]
+            return False
+        return True
+    
+    def _schedule_job(self, job: ScheduledJob) -> bool:
+        """Push the job's next run onto the heap if it is still registered."""
+        now = datetime.now()
+        next_run = CronParser.next_run_time(job.cron_expression, now)
+        if next_run is None:
             return False
+        
+        with self._jobs_lock:
+            if self._job_registry.get(job.name) is not job:
+                return False  # Cleared or replaced while it was running
+            job.next_run = next_run
+            run_at = time.monotonic() + (next_run - now).total_seconds()
+            heapq.heappush(self._jobs, (run_at, next(self._job_sequence), job))
+        self._wakeup.set()
+        return True
+    
+    def _clear_jobs(self) -> None:
+        """Remove all scheduled jobs."""
+        with self._jobs_lock:
+            self._jobs.clear()
+            self._job_registry.clear()
+        self._wakeup.set()
     
     def _update_tle_data(self):
         """Update TLE data task."""
@@ -211,11 +308,11 @@ class StarlinkScheduler:
             self.logger.info("Starting TLE data update task")
             if self.tracker:
                 satellites = self.tracker.update_tle_data(force=True)
-                self.logger.info(f"TLE data update completed. Loaded {len(satellites) if satellites else 0} satellites")
+                self.logger.info("TLE data update completed. Loaded %d satellites", len(satellites) if satellites else 0)
             else:
                 self.logger.warning("No tracker instance available for TLE update")
         except Exception as e:
-            self.logger.error(f"TLE data update failed: {e}")
+            self.logger.error("TLE data update failed: %s", e)
     
     def _update_predictions(self):
         """Update predictions task."""
@@ -229,7 +326,7 @@ class StarlinkScheduler:
             # For now, we'll just log that the task ran
             self.logger.info("Prediction update completed")
         except Exception as e:
-            self.logger.error(f"Prediction update failed: {e}")
+            self.logger.error("Prediction update failed: %s", e)
     
     def _check_notifications(self):
         """Check and send notifications task."""
@@ -243,9 +340,6 @@ class StarlinkScheduler:
             # Check for upcoming passes and send notifications
             if self.tracker:
                 try:
-                    # Import notification system
-                    from utils.notify import NotificationSystem
-                    
                     # Get observer location from config
                     observer_config = self.config.get('observer', {})
                     lat = observer_config.get('default_latitude', 55.7558)
@@ -259,46 +353,41 @@ class StarlinkScheduler:
                     # Predict passes for the next 2 hours
                     passes = self.tracker.predict_passes(lat, lon, alt, hours_ahead=2)
                     
-                    # Initialize notification system
-                    notifier = NotificationSystem(self.config)
+                    # Reuse the notification system and its open connections
+                    notifier = self._get_notifier()
                     
-                    # Check each pass
-                    current_time = datetime.now()
+                    # Collect passes coming up within the advance notice window;
+                    # the tracker returns aware UTC times, naive ones are local
+                    current_time = datetime.now(timezone.utc)
+                    due_passes = []
                     for pass_info in passes:
                         pass_time = pass_info.get('time')
                         if not pass_time:
                             continue
+                        if pass_time.tzinfo is None:
+                            pass_time = pass_time.astimezone()
                         
                         # Calculate time until pass
                         time_until_pass = (pass_time - current_time).total_seconds() / 60  # in minutes
                         
                         # Check if this pass is coming up soon (within advance notice window)
                         if 0 < time_until_pass <= advance_notice:
-                            # Send notification
-                            satellite_name = pass_info.get('satellite', 'Unknown')
-                            max_elevation = pass_info.get('altitude', 0)
-                            azimuth = pass_info.get('azimuth', 0)
-                            brightness = pass_info.get('brightness', 0)
-                            velocity = pass_info.get('velocity', 0)
-                            
-                            notifier.notify_upcoming_pass(
-                                satellite_name, 
-                                pass_time, 
-                                max_elevation, 
-                                azimuth,
-                                brightness,
-                                velocity
-                            )
+                            due_passes.append(pass_info)
+                    
+                    # Send one digest per channel for the whole tick, off the
+                    # scheduler thread
+                    if due_passes:
+                        self._get_notify_executor().submit(notifier.notify_upcoming_passes, due_passes)
                 except ImportError:
                     self.logger.warning("Notification system not available")
                 except Exception as e:
-                    self.logger.error(f"Error checking passes for notifications: {e}")
+                    self.logger.error("Error checking passes for notifications: %s", e)
             else:
                 self.logger.warning("No tracker instance available for notification check")
             
             self.logger.info("Notification check completed")
         except Exception as e:
-            self.logger.error(f"Notification check failed: {e}")
+            self.logger.error("Notification check failed: %s", e)
     
     def start_scheduler(self) -> bool:
         """Start the scheduler in a background thread."""
@@ -312,13 +401,16 @@ class StarlinkScheduler:
                 return False
             
             self.running = True
-            self.thread = threading.Thread(target=self._run_scheduler, daemon=True)
+            self._stop_event = threading.Event()
+            self.thread = threading.Thread(target=self._run_scheduler, args=(self._stop_event,),
+                                           daemon=True)
             self.thread.start()
+            self._warm_up_notifier()
             self.logger.info("Scheduler started")
             return True
             
         except Exception as e:
-            self.logger.error(f"Error starting scheduler: {e}")
+            self.logger.error("Error starting scheduler: %s", e)
             self.running = False
             return False
     
@@ -326,53 +418,154 @@ class StarlinkScheduler:
         """Stop the scheduler."""
         try:
             # Always clear scheduled jobs, regardless of running state
-            schedule.clear()
+            self._clear_jobs()
             
             if not self.running:
                 self.logger.warning("Scheduler is not running")
                 return True
             
             self.running = False
+            self._stop_event.set()
+            self._wakeup.set()
             if self.thread:
                 self.thread.join(timeout=5)
+            if self._job_executor is not None:
+                # Drop queued runs; jobs already running finish in the background
+                self._job_executor.shutdown(wait=False, cancel_futures=True)
+                self._job_executor = None
+            with self._jobs_lock:
+                self._running_jobs.clear()
             self.execution_cache.clear()
+            self._close_notifier()
             self.logger.info("Scheduler stopped")
             return True
             
         except Exception as e:
-            self.logger.error(f"Error stopping scheduler: {e}")
+            self.logger.error("Error stopping scheduler: %s", e)
             return False
     
-    def _run_scheduler(self):
-        """Run the scheduler loop."""
-        while self.running:
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the scheduler is stopped or ``timeout`` elapses.
+
+        Returns True if the scheduler was stopped. Lets callers keep the
+        main thread alive without polling.
+        """
+        return self._stop_event.wait(timeout)
+    
+    def _get_notifier(self):
+        """Return the shared notification system, creating it on first use."""
+        if self._notifier is None:
+            # Import notification system
+            from utils.notify import NotificationSystem
+            self._notifier = NotificationSystem(self.config)
+            atexit.register(self._close_notifier)
+        return self._notifier
+    
+    def _get_notify_executor(self) -> ThreadPoolExecutor:
+        """Return the background notification worker, creating it on first use."""
+        if self._notify_executor is None:
+            self._notify_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='scheduler-notify')
+        return self._notify_executor
+    
+    def _warm_up_notifier(self) -> None:
+        """Open notification connections in the background before the first alert."""
+        if not self.tracker:
+            return  # Notification checks need a tracker, so nothing will be sent
+        try:
+            notifier = self._get_notifier()
+            self._get_notify_executor().submit(notifier.warm_up)
+        except ImportError:
+            self.logger.warning("Notification system not available")
+        except Exception as e:
+            self.logger.warning("Notification warm-up failed: %s", e)
+    
+    def _close_notifier(self) -> None:
+        """Wait for queued notifications, then release the notifier's connections."""
+        if self._notify_executor is not None:
+            self._notify_executor.shutdown(wait=True)
+            self._notify_executor = None
+        if self._notifier is not None:
+            self._notifier.close()
+            self._notifier = None
+    
+    def _run_scheduler(self, stop_event: threading.Event):
+        """Run the scheduler loop, sleeping until the earliest job is due."""
+        errors = 0
+        while not stop_event.is_set():
             try:
-                schedule.run_pending()
-                time.sleep(1)
+                self._wakeup.clear()
+                due, delay = [], None
+                with self._jobs_lock:
+                    # Take every job that is due in one pass; cron schedules
+                    # often coincide (e.g. */15 and */30 at the half hour)
+                    now = time.monotonic()
+                    while self._jobs and self._jobs[0][0] <= now:
+                        due.append(heapq.heappop(self._jobs)[2])
+                    if not due and self._jobs:
+                        delay = self._jobs[0][0] - now
+                
+                if not due:
+                    # Park until the next job is due, jobs change or stop is requested
+                    errors = 0
+                    self._wakeup.wait(delay)
+                    continue
+                
+                for job in due:
+                    if stop_event.is_set():
+                        break
+                    try:
+                        self._dispatch_job(job)
+                    finally:
+                        self._schedule_job(job)
+                errors = 0
             except Exception as e:
-                self.logger.error(f"Scheduler error: {e}")
-                time.sleep(10)  # Wait longer on error
+                errors += 1
+                backoff = min(ERROR_BACKOFF_MIN_SECONDS << min(errors - 1, 5), ERROR_BACKOFF_MAX_SECONDS)
+                self.logger.error("Scheduler error: %s; retrying in %ss", e, backoff)
+                self._wakeup.wait(backoff)
+    
+    def _dispatch_job(self, job: ScheduledJob) -> None:
+        """Hand a due job to the worker pool unless it is still running."""
+        with self._jobs_lock:
+            if job.name in self._running_jobs:
+                self.logger.warning("Skipping %s, previous run still in progress", job.name)
+                return
+            self._running_jobs.add(job.name)
+            if self._job_executor is None:
+                self._job_executor = ThreadPoolExecutor(
+                    max_workers=max(len(self._job_registry), 1),
+                    thread_name_prefix='sched-worker')
+            executor = self._job_executor
+        try:
+            executor.submit(self._run_job, job)
+        except Exception:
+            with self._jobs_lock:
+                self._running_jobs.discard(job.name)
+            raise
+    
+    def _run_job(self, job: ScheduledJob) -> None:
+        """Run a job on a worker thread, logging any failure."""
+        try:
+            job.function()
+        except Exception as e:
+            self.logger.error("Job %s failed: %s", job.name, e)
+        finally:
+            with self._jobs_lock:
+                self._running_jobs.discard(job.name)
     
     def get_scheduled_jobs(self) -> list:
         """Get information about scheduled jobs."""
         try:
-            jobs = []
-            for job in schedule.get_jobs():
-                # Handle tags properly
-                tags = getattr(job, 'tags', None)
-                if tags and isinstance(tags, (set, list)) and len(tags) > 0:
-                    name = list(tags)[0] if isinstance(tags, set) else tags[0]
-                else:
-                    name = 'Unknown'
-                
-                jobs.append({
-                    'name': name,
-                    'next_run': getattr(job, 'next_run', None),
-                    'interval': str(getattr(job, 'interval', 'Unknown'))
-                })
-            return jobs
+            with self._jobs_lock:
+                registered = list(self._job_registry.values())
+            return [{
+                'name': job.name,
+                'next_run': job.next_run,
+                'interval': job.cron_expression
+            } for job in registered]
         except Exception as e:
-            self.logger.error(f"Error getting scheduled jobs: {e}")
+            self.logger.error("Error getting scheduled jobs: %s", e)
             return []
     
     def clear_cache(self) -> None:
@@ -400,7 +593,7 @@ def main():
                 if jobs:
                     logging.info("Scheduled jobs:")
                     for job in jobs:
-                        logging.info(f"  {job['name']}: Next run at {job['next_run']}")
+                        logging.info("  %s: Next run at %s", job['name'], job['next_run'])
                 
                 time.sleep(30)
         except KeyboardInterrupt:
@@ -4,17 +4,26 @@ Web interface for Starlink Satellite Tracker
 Provides a dashboard for visualizing satellite positions, passes, and coverage.
 """
 
+import gzip
+import hashlib
 import json
 import os
 import sys
 import math
-from datetime import datetime, timedelta
-from flask import Flask, render_template, jsonify, request
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from operator import itemgetter
+from datetime import date, datetime, timedelta
+from flask import Flask, Response, make_response, render_template, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+from jinja2 import FileSystemBytecodeCache
 import logging
-from functools import wraps
-import hashlib
+from functools import lru_cache, wraps
 import base64
 from io import BytesIO
+import numpy as np
 
 # Try to import skyfield, but handle if not available
 try:
@@ -25,11 +34,47 @@ except ImportError:
     load = None
     logging.warning("Skyfield not installed. Some visualization features disabled.")
 
+# Try to import orjson for faster API responses, but fall back to stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None  # Define orjson as None to avoid undefined variable
+
+# Try to import msgpack for a compact binary Redis cache codec, but fall back
+# to JSON
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    msgpack = None  # Define msgpack as None to avoid undefined variable
+
+# Try to import flask-compress for gzip/brotli responses, but serve
+# uncompressed without it
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
+    Compress = None  # Define Compress as None to avoid undefined variable
+
+# Try to import brotli to precompress pages, but fall back to gzip only
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+    brotli = None  # Define brotli as None to avoid undefined variable
+
 # Add the src directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-# Import our configuration manager
+# Import our configuration manager and the data processor used by the
+# export and statistics endpoints, once at startup rather than per request
 from utils.config_manager import get_config
+from utils.data_processor import DataProcessor
 
 # Import tracker module with error handling
 try:
@@ -109,6 +154,9 @@ except ImportError:
                 }
             ]
         
+        def get_satellite_arrays(self):
+            return np.array([], dtype=object), np.array([], dtype=np.int32)
+        
         def get_satellite_info(self, satellite_name):
             return {
                 'name': satellite_name,
@@ -140,72 +188,179 @@ except ImportError:
 # Multi-level cache for API responses
 # Uses Redis for persistent caching and in-memory for fast access
 class APICache:
-    def __init__(self, default_ttl=300):  # 5 minutes default TTL
-        self.cache = {}
-        self.timestamps = {}
+    def __init__(self, default_ttl=300, max_entries=1024):  # 5 minutes default TTL
+        # LRU of key -> (monotonic expiry, value), bounded so sweeping
+        # query parameters cannot grow it without limit
+        self.cache = OrderedDict()
         self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self._lock = threading.RLock()
         self.logger = logging.getLogger(__name__)
+        # While Redis is down, calls are skipped until the next probe time;
+        # the wait doubles after each failed probe
+        self._redis_retry_delay = self.REDIS_RETRY_MIN_SECONDS
+        self._redis_next_probe = 0.0
+        self.redis_client = None
+        self.use_redis = False
         
         # Try to initialize Redis cache
         try:
             import redis
-            self.redis_client = redis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
+            # One pool shared by all request threads, with keepalive so idle
+            # connections survive between bursts; raw bytes go straight to the
+            # decoder, skipping a UTF-8 decode
+            pool = redis.ConnectionPool(host='localhost', port=6379, db=0,
+                                        max_connections=64, socket_keepalive=True,
+                                        decode_responses=False)
+            self.redis_client = redis.Redis(connection_pool=pool)
             self.redis_client.ping()  # Test connection
             self.use_redis = True
             self.logger.info("Redis cache initialized successfully")
         except ImportError:
-            self.redis_client = None
-            self.use_redis = False
             self.logger.warning("Redis library not installed. Install with: pip install redis")
         except Exception as e:
-            self.redis_client = None
-            self.use_redis = False
-            self.logger.warning(f"Redis not available, using in-memory cache only. Error: {e}")
+            # Keep the client so a later probe can pick Redis up once it is
+            # running
+            self._redis_failed("connecting to Redis", e)
+    
+    REDIS_RETRY_MIN_SECONDS = 30
+    REDIS_RETRY_MAX_SECONDS = 600
+    
+    def _redis_ready(self):
+        """Return whether to try Redis now: it is healthy or a probe is due."""
+        if self.redis_client is None:
+            return False
+        return self.use_redis or time.monotonic() >= self._redis_next_probe
+    
+    def _redis_failed(self, action, error):
+        """Stop using Redis until the next probe, backing off exponentially."""
+        delay = self._redis_retry_delay
+        self.use_redis = False
+        self._redis_next_probe = time.monotonic() + delay
+        self._redis_retry_delay = min(delay * 2, self.REDIS_RETRY_MAX_SECONDS)
+        self.logger.warning(f"Error {action}, using in-memory cache only for {delay}s. Error: {error}")
+    
+    def _redis_succeeded(self):
+        """Resume using Redis after a successful probe."""
+        if not self.use_redis:
+            self.use_redis = True
+            self._redis_retry_delay = self.REDIS_RETRY_MIN_SECONDS
+            self.logger.info("Redis cache available again")
+    
+    # Keys are prefixed with the codec so entries written by a process using
+    # a different codec are missed instead of being mis-decoded
+    REDIS_KEY_PREFIX = 'msgpack:' if MSGPACK_AVAILABLE else 'json:'
+    
+    @classmethod
+    def _redis_key(cls, key):
+        """Return a Redis string key for any hashable in-memory key."""
+        return cls.REDIS_KEY_PREFIX + (key if isinstance(key, str) else repr(key))
+    
+    @staticmethod
+    def _encode(value):
+        """Serialize a value for Redis with msgpack, orjson or json.
+        
+        msgpack stores the cached response body as raw bytes, without the
+        quoting and escaping a JSON string needs; the JSON codecs store it
+        as UTF-8 text.
+        """
+        if MSGPACK_AVAILABLE:
+            return msgpack.packb(value, use_bin_type=True)
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(value, default=APICache._text)
+        return json.dumps(value, default=APICache._text)
+    
+    @staticmethod
+    def _text(value):
+        """Represent response body bytes as text for the JSON codecs."""
+        if isinstance(value, bytes):
+            return value.decode('utf-8')
+        raise TypeError(f"Cannot serialize {type(value).__name__}")
+    
+    @staticmethod
+    def _decode(data):
+        """Deserialize a value read back from Redis."""
+        if MSGPACK_AVAILABLE:
+            return msgpack.unpackb(data, raw=False)
+        if ORJSON_AVAILABLE:
+            return orjson.loads(data)
+        return json.loads(data)
     
     def get(self, key):
-        """Retrieve cached data from Redis or in-memory cache."""
-        # Try to get from Redis first (if available)
-        if self.use_redis and self.redis_client:
-            try:
-                cached_data = self.redis_client.get(key)
-                if cached_data and isinstance(cached_data, (str, bytes)):
-                    self.logger.debug(f"Redis cache hit for key: {key}")
-                    return json.loads(cached_data)
-            except Exception as e:
-                self.logger.warning(f"Error retrieving from Redis cache: {e}")
-        
-        # Fall back to in-memory cache
-        if key in self.cache:
-            timestamp = self.timestamps[key]
-            if (datetime.now() - timestamp).total_seconds() < self.default_ttl:
-                self.logger.debug(f"In-memory cache hit for key: {key}")
-                return self.cache[key]
-            else:
-                # Remove expired entry
-                del self.cache[key]
-                del self.timestamps[key]
-                self.logger.debug(f"In-memory cache expired for key: {key}")
+        """Retrieve cached data from the in-memory cache, then Redis."""
+        value = self.get_local(key)
+        if value is None and self._redis_ready():
+            value = self.get_redis(key)
+        return value
+    
+    def get_local(self, key):
+        """Retrieve cached data from the in-memory cache only.
+        
+        The key is used as is, so hits cost one dict lookup with no string
+        key or digest built.
+        """
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                return None
+            if entry[0] > time.monotonic():
+                self.cache.move_to_end(key)
+                self.logger.debug("In-memory cache hit for key: %s", key)
+                return entry[1]
+            # Remove expired entry
+            del self.cache[key]
+        self.logger.debug("In-memory cache expired for key: %s", key)
         return None
     
-    def set(self, key, value):
-        """Store data in both Redis and in-memory cache."""
+    def get_redis(self, key):
+        """Retrieve cached data from Redis, keeping a local copy on a hit."""
+        try:
+            # Value and remaining lifetime in one round trip
+            pipe = self.redis_client.pipeline(transaction=False)
+            redis_key = self._redis_key(key)
+            pipe.get(redis_key)
+            pipe.ttl(redis_key)
+            cached_data, ttl = pipe.execute()
+        except Exception as e:
+            self._redis_failed("retrieving from Redis cache", e)
+            return None
+        self._redis_succeeded()
+        if cached_data is None:
+            return None
+        
+        self.logger.debug("Redis cache hit for key: %s", key)
+        value = self._decode(cached_data)
+        if ttl > 0:
+            self._set_local(key, value, ttl)
+        return value
+    
+    def set(self, key, value, ttl=None):
+        """Store data in both Redis and in-memory cache for ``ttl`` seconds."""
+        ttl = self.default_ttl if ttl is None else ttl
         # Store in Redis (if available)
-        if self.use_redis and self.redis_client:
+        if self._redis_ready():
             try:
-                self.redis_client.setex(key, int(self.default_ttl), json.dumps(value))
-                self.logger.debug(f"Cached data in Redis for key: {key}")
+                self.redis_client.setex(self._redis_key(key), int(ttl), self._encode(value))
+                self._redis_succeeded()
+                self.logger.debug("Cached data in Redis for key: %s", key)
             except Exception as e:
-                self.logger.warning(f"Error storing in Redis cache: {e}")
+                self._redis_failed("storing in Redis cache", e)
         
-        # Store in in-memory cache
-        self.cache[key] = value
-        self.timestamps[key] = datetime.now()
-        self.logger.debug(f"Cached data in memory for key: {key}")
+        self._set_local(key, value, ttl)
+    
+    def _set_local(self, key, value, ttl):
+        """Store data in the in-memory cache, evicting the least recently used."""
+        with self._lock:
+            self.cache[key] = (time.monotonic() + ttl, value)
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)
+        self.logger.debug("Cached data in memory for key: %s", key)
     
     def clear(self):
         """Clear all cached data from both Redis and in-memory cache."""
         # Clear Redis cache (if available)
-        if self.use_redis and self.redis_client:
+        if self._redis_ready():
             try:
                 self.redis_client.flushdb()
                 self.logger.debug("Redis cache cleared")
@@ -213,31 +368,62 @@ class APICache:
                 self.logger.warning(f"Error clearing Redis cache: {e}")
         
         # Clear in-memory cache
-        self.cache.clear()
-        self.timestamps.clear()
+        with self._lock:
+            self.cache.clear()
         self.logger.debug("In-memory cache cleared")
 
 # Initialize cache
 api_cache = APICache()
 
 # Cache decorator for API endpoints
+# Browsers may reuse an API response for this long before revalidating it
+# with its ETag; kept short because the server-side entries live longer
+API_MAX_AGE_SECONDS = 30
+
+def cacheable_response(body, mimetype, etag):
+    """Build a response for a cached body, or a 304 if the client has it.
+    
+    The ETag is weak so it still matches once the response is compressed.
+    """
+    response = Response(body, mimetype=mimetype)
+    response.set_etag(etag, weak=True)
+    response.cache_control.public = True
+    response.cache_control.max_age = API_MAX_AGE_SECONDS
+    return response.make_conditional(request)
+
 def cached(ttl=300):
     def decorator(f):
         @wraps(f)
         def wrapper(*args, **kwargs):
-            # Generate cache key from function name and arguments
-            cache_key = f.__name__ + str(args) + str(sorted(kwargs.items()))
-            cache_key = hashlib.md5(cache_key.encode()).hexdigest()
+            # Key on the endpoint, its URL arguments and the query string;
+            # a plain tuple is hashed by the dict itself, no digest needed.
+            # Flask passes URL variables as keyword arguments, and most
+            # endpoints have none, so skip sorting an empty dict
+            if kwargs:
+                cache_key = (f.__name__, args, tuple(sorted(kwargs.items())), request.query_string)
+            else:
+                cache_key = (f.__name__, args, request.query_string)
+            try:
+                hash(cache_key)
+            except TypeError:
+                cache_key = repr(cache_key)
             
-            # Try to get from cache
+            # Cache the encoded body and its ETag rather than the Response
+            # object, so hits return the stored bytes without encoding or
+            # hashing them again. Entries in the older two-field layout are
+            # treated as misses
             cached_result = api_cache.get(cache_key)
-            if cached_result is not None:
-                return cached_result
+            if cached_result is not None and len(cached_result) == 3:
+                return cacheable_response(*cached_result)
             
-            # Execute function and cache result
-            result = f(*args, **kwargs)
-            api_cache.set(cache_key, result)
-            return result
+            # Execute function and cache successful results only
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            body = response.get_data()
+            etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+            api_cache.set(cache_key, (body, response.mimetype, etag), ttl)
+            return cacheable_response(body, response.mimetype, etag)
         return wrapper
     return decorator
 
@@ -248,7 +434,7 @@ def handle_api_errors(f):
         try:
             return f(*args, **kwargs)
         except Exception as e:
-            logging.error(f"API error in {f.__name__}: {e}")
+            app.logger.error("API error in %s: %s", f.__name__, e)
             return jsonify({
                 'error': 'Internal server error',
                 'message': str(e) if app.config.get('DEBUG') else 'An error occurred'
@@ -263,6 +449,29 @@ def format_datetime_for_json(dt):
     return dt
 
 
+def parse_location_args():
+    """Parse and validate the lat, lon and hours query parameters.
+    
+    Returns a (lat, lon, hours) tuple. Raises ValueError with a message
+    suitable for the client when a value is malformed or out of range.
+    """
+    args = request.args
+    try:
+        lat = float(args.get('lat', DEFAULT_LATITUDE))
+        lon = float(args.get('lon', DEFAULT_LONGITUDE))
+        hours = int(args.get('hours', 24))
+    except ValueError:
+        raise ValueError('Invalid parameter format.') from None
+    
+    if not (-90 <= lat <= 90):
+        raise ValueError('Invalid latitude. Must be between -90 and 90.')
+    if not (-180 <= lon <= 180):
+        raise ValueError('Invalid longitude. Must be between -180 and 180.')
+    if not (1 <= hours <= 168):  # Max 1 week
+        raise ValueError('Invalid hours. Must be between 1 and 168.')
+    return lat, lon, hours
+
+
 def calculate_orbital_velocity(satellite, time_point):
     """Calculate orbital velocity for a satellite at a given time."""
     try:
@@ -299,105 +508,218 @@ def calculate_orbital_period(satellite, time_point):
     except Exception:
         return 0.0
 
+class ISODateJSONProvider(DefaultJSONProvider):
+    """JSON provider that writes dates and datetimes in ISO 8601.
+    
+    Flask's default handler formats them as HTTP dates; ISO matches the
+    strings the API builds itself and what orjson emits natively.
+    """
+    
+    @staticmethod
+    def default(o):
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+
+class ORJSONProvider(ISODateJSONProvider):
+    """JSON provider that encodes ``jsonify`` responses with orjson.
+    
+    Datetimes and numpy scalars are encoded natively in C, in the same form
+    as the stdlib provider (which treats ``np.float64`` as a float);
+    decimals and other non-native types go through the default handler.
+    """
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+
 app = Flask(__name__, template_folder=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '..', 'templates'))
+app.json = ORJSONProvider(app) if ORJSON_AVAILABLE else ISODateJSONProvider(app)
+
+# Keep compiled templates on disk (a per-user temp directory) so new worker
+# processes load them instead of parsing the template sources again
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+
+# Compress pages and JSON for clients that accept it. Low levels keep the
+# CPU cost small next to the bytes saved; streamed CSV exports are left
+# uncompressed so they are not buffered
+if COMPRESS_AVAILABLE:
+    app.config.update(
+        COMPRESS_ALGORITHM=['br', 'gzip'],
+        COMPRESS_MIN_SIZE=500,
+        COMPRESS_LEVEL=4,
+        COMPRESS_BR_LEVEL=4,
+        COMPRESS_STREAMS=False,
+    )
+    Compress(app)
 
 # Load configuration
 config = get_config()
 
-# Set default observer location from config
-if 'observer' in config:
-    DEFAULT_LATITUDE = config['observer'].get('default_latitude', 55.7558)
-    DEFAULT_LONGITUDE = config['observer'].get('default_longitude', 37.6173)
-else:
-    DEFAULT_LATITUDE = 55.7558  # Moscow
-    DEFAULT_LONGITUDE = 37.6173
+# Set default observer location from config (Moscow when not configured)
+_observer_config = config.get('observer', {})
+DEFAULT_LATITUDE = _observer_config.get('default_latitude', 55.7558)
+DEFAULT_LONGITUDE = _observer_config.get('default_longitude', 37.6173)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, 
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
+# Tracker hooks resolved once; the minimal fallback tracker has no scheduler
+_start_scheduler = getattr(tracker_instance, 'start_scheduler', None)
+_clear_tracker_caches = getattr(tracker_instance, 'clear_caches', None)
+
 # Start scheduler for automated tasks (if available)
-if TRACKER_AVAILABLE:
+if TRACKER_AVAILABLE and _start_scheduler is not None:
     try:
-        # Try to start scheduler if method exists
-        if hasattr(tracker_instance, 'start_scheduler'):
-            try:
-                tracker_instance.start_scheduler()
-            except:
-                pass  # Ignore scheduler errors
+        _start_scheduler()
     except Exception as e:
         app.logger.warning(f"Could not start scheduler: {e}")
 
+@lru_cache(maxsize=32)
 def get_template_name(base_name, language='en'):
     """Get template name based on language preference."""
     if language == 'ru':
         return f"{base_name}_ru.html"
     return f"{base_name}.html"
 
+# Languages with their own page templates
+PAGE_LANGUAGES = ('en', 'ru')
+
+# Rendered HTML by (page, language), and its compressed bytes by (page,
+# language, encoding). The page templates take no context, so the output
+# only changes when a template file does
+_page_cache = {}
+
+# Browsers may reuse a page for this long; the data on it is fetched from the
+# API, so only template changes are delayed
+PAGE_MAX_AGE_SECONDS = 300
+
+# Encodings pages are precompressed in, in order of preference
+PAGE_ENCODINGS = ('br', 'gzip') if BROTLI_AVAILABLE else ('gzip',)
+
+def compress_page(html, encoding):
+    """Compress rendered page HTML at the highest level for ``encoding``.
+    
+    Pages are compressed once and cached, so the slow maximum levels cost
+    nothing per request.
+    """
+    data = html.encode('utf-8')
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9)
+
+def render_page(base_name):
+    """Render a page in the requested language, reusing earlier output.
+    
+    Cached pages are found with a single lookup on the page and the raw
+    ``lang`` argument, without resolving the template name. Cached pages
+    are also kept precompressed in the best encoding the client accepts.
+    """
+    key = (base_name, request.args.get('lang', 'en'))
+    html = _page_cache.get(key)
+    if html is None:
+        html = render_template(get_template_name(*key))
+        # Keep re-rendering while templates are reloaded from disk (debug)
+        if app.jinja_env.auto_reload:
+            return html
+        # Other lang values fall back to English; they are not cached so
+        # arbitrary query strings cannot grow the cache
+        if key[1] in PAGE_LANGUAGES:
+            _page_cache[key] = html
+    
+    # Uncached pages are left to flask-compress, if installed
+    encoding = None
+    if key[1] in PAGE_LANGUAGES:
+        encoding = request.accept_encodings.best_match(PAGE_ENCODINGS)
+    if encoding is None:
+        response = Response(html, mimetype='text/html')
+    else:
+        compressed_key = key + (encoding,)
+        body = _page_cache.get(compressed_key)
+        if body is None:
+            body = _page_cache[compressed_key] = compress_page(html, encoding)
+        response = Response(body, mimetype='text/html')
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.max_age = PAGE_MAX_AGE_SECONDS
+    return response
+
 @app.route('/')
 def index():
     """Main dashboard showing current satellite positions."""
-    language = request.args.get('lang', 'en')
-    template = get_template_name('index', language)
-    return render_template(template)
+    return render_page('index')
 
 @app.route('/passes')
 def passes():
     """Page showing upcoming satellite passes."""
-    language = request.args.get('lang', 'en')
-    template = get_template_name('passes', language)
-    return render_template(template)
+    return render_page('passes')
 
 @app.route('/coverage')
 def coverage():
     """Page showing global Starlink coverage."""
-    language = request.args.get('lang', 'en')
-    template = get_template_name('coverage', language)
-    return render_template(template)
+    return render_page('coverage')
 
 @app.route('/settings')
 def settings():
     """Page for configuring observer location and notification settings."""
-    language = request.args.get('lang', 'en')
-    template = get_template_name('settings', language)
-    return render_template(template)
+    return render_page('settings')
 
 @app.route('/export')
 def export():
     """Page for exporting satellite data."""
-    language = request.args.get('lang', 'en')
-    template = get_template_name('export', language)
-    return render_template(template)
+    return render_page('export')
 
 @app.route('/visualization')
 def visualization():
     """Page for interactive satellite visualization."""
-    language = request.args.get('lang', 'en')
-    template = get_template_name('visualization', language)
-    return render_template(template)
+    return render_page('visualization')
 
 
 @app.route('/map')
 def map_view():
     """Page for real-time satellite map."""
-    language = request.args.get('lang', 'en')
-    template = get_template_name('map', language)
-    return render_template(template)
+    return render_page('map')
 
 
 @app.route('/statistics')
 def statistics():
     """Page for satellite statistics."""
-    language = request.args.get('lang', 'en')
-    template = get_template_name('statistics', language)
-    return render_template(template)
+    return render_page('statistics')
 
 @app.route('/ar')
 def ar_view():
     """Page for augmented reality view."""
-    language = request.args.get('lang', 'en')
-    template = get_template_name('ar_view', language)
-    return render_template(template)
+    return render_page('ar_view')
+
+# (name array, summaries) for the most recent satellite list
+_satellite_summaries = None
+
+def satellite_summaries(names, limit=50):
+    """Return name/id summaries for the first ``limit`` satellites.
+    
+    The id is the part of the name after the last dash, or the whole name
+    when there is none. The tracker keeps the same name array until new TLE
+    data is loaded, so the list is built once per load and shared; callers
+    must not modify it.
+    """
+    global _satellite_summaries
+    cached_summaries = _satellite_summaries
+    if cached_summaries is not None and cached_summaries[0] is names:
+        return cached_summaries[1]
+    
+    summaries = [{
+        'name': name,
+        'id': name.rpartition('-')[2]
+    } for name in names[:limit].tolist()]
+    _satellite_summaries = (names, summaries)
+    return summaries
 
 @app.route('/api/satellites')
 @handle_api_errors
@@ -411,19 +733,16 @@ def api_satellites():
         # Debug: Print number of satellites loaded
         app.logger.info(f"Loaded {len(satellites)} satellites")
         
-        # Return simplified satellite data
-        sat_data = []
-        for sat in satellites[:50]:  # Limit to first 50 for performance
-            sat_data.append({
-                'name': sat.name,
-                'id': sat.name.split('-')[-1] if '-' in sat.name else sat.name
-            })
+        # Return simplified satellite data, rebuilt only after a TLE load
+        sat_data = satellite_summaries(tracker_instance.get_satellite_arrays()[0])
         
+        # Rendered once per cache miss; hits replay the stored body as is
+        updated = datetime.now().isoformat()
         return jsonify({
             'satellites': sat_data,
             'count': len(sat_data),
             'total_count': len(satellites),
-            'updated': datetime.now().isoformat()
+            'updated': updated
         })
     except Exception as e:
         app.logger.error(f"Error in api_satellites: {e}")
@@ -442,43 +761,74 @@ def api_passes():
     """API endpoint returning predicted satellite passes."""
     # Get location parameters from request or use defaults
     try:
-        lat = float(request.args.get('lat', DEFAULT_LATITUDE))
-        lon = float(request.args.get('lon', DEFAULT_LONGITUDE))
-        hours = int(request.args.get('hours', 24))
-        
-        # Validate parameters
-        if not (-90 <= lat <= 90):
-            return jsonify({'error': 'Invalid latitude. Must be between -90 and 90.'}), 400
-        if not (-180 <= lon <= 180):
-            return jsonify({'error': 'Invalid longitude. Must be between -180 and 180.'}), 400
-        if not (1 <= hours <= 168):  # Max 1 week
-            return jsonify({'error': 'Invalid hours. Must be between 1 and 168.'}), 400
+        lat, lon, hours = parse_location_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        limit = int(request.args.get('limit', 0))  # 0 returns every pass
     except ValueError:
         return jsonify({'error': 'Invalid parameter format.'}), 400
+    if limit < 0:
+        return jsonify({'error': 'Invalid limit. Must be 0 or greater.'}), 400
     
     try:
         # Predict passes
         passes = tracker_instance.predict_passes(lat, lon, hours_ahead=hours)
+        total_count = len(passes)
+        
+        # Sort by time into a new list, since the tracker shares the
+        # returned list through its prediction cache; when only the next few
+        # passes are wanted, select them without sorting the whole window
+        by_time = itemgetter('time')
+        if limit:
+            passes = heapq.nsmallest(limit, passes, key=by_time)
+        else:
+            passes = sorted(passes, key=by_time)
         
-        # Sort by time
-        passes.sort(key=lambda x: x['time'])
-        
-        # Format for JSON serialization
-        formatted_passes = []
-        for p in passes:
-            formatted_passes.append({
-                'satellite': p['satellite'],
-                'time': p['time'].isoformat(),
-                'altitude': round(p['altitude'], 1),
-                'azimuth': round(p['azimuth'], 1),
-                'distance': round(p['distance'], 1),
-                'velocity': round(p['velocity'], 2) if 'velocity' in p else 0,
-                'brightness': round(p['brightness'], 1) if 'brightness' in p else 5.0
-            })
+        # Round each numeric column in one vectorized call; rounding keeps
+        # the payload compact for week-long windows
+        count = len(passes)
+        
+        def rounded_column(field, decimals, default=None):
+            if default is None:
+                values = (p[field] for p in passes)
+            else:
+                values = (p.get(field, default) for p in passes)
+            return np.round(np.fromiter(values, dtype=float, count=count), decimals)
+        
+        # Display values the pages used to work out per row: an approximate
+        # duration (a minute per 10 degrees, rounded half up like
+        # Math.round) and the elevation bar width in percent
+        altitudes = rounded_column('altitude', 1)
+        durations = np.maximum(1, np.floor(altitudes / 10 + 0.5)).astype(int)
+        bar_widths = np.minimum(100.0, altitudes)
+        
+        # Times stay datetimes; the JSON provider writes them as ISO 8601,
+        # natively in C when orjson is installed
+        formatted_passes = [{
+            'satellite': p['satellite'],
+            'time': p['time'],
+            'altitude': altitude,
+            'azimuth': azimuth,
+            'distance': distance,
+            'velocity': velocity,
+            'brightness': brightness,
+            'duration_min': duration,
+            'bar_pct': bar_pct
+        } for p, altitude, azimuth, distance, velocity, brightness, duration, bar_pct in zip(
+            passes,
+            altitudes.tolist(),
+            rounded_column('azimuth', 1).tolist(),
+            rounded_column('distance', 1).tolist(),
+            rounded_column('velocity', 2, default=0.0).tolist(),
+            rounded_column('brightness', 1, default=5.0).tolist(),
+            durations.tolist(),
+            bar_widths.tolist())]
         
         return jsonify({
             'passes': formatted_passes,
             'count': len(formatted_passes),
+            'total_count': total_count,
             'location': {'latitude': lat, 'longitude': lon},
             'period_hours': hours,
             'generated': datetime.now().isoformat()
@@ -491,6 +841,35 @@ def api_passes():
             'error': 'Failed to predict satellite passes'
         }), 500
 
+# Sample coverage model: (region, share of the constellation, coverage %).
+# Only the satellite counts depend on the loaded TLE data
+COVERAGE_REGIONS = (
+    ('North America', 0.4, 98.5),
+    ('Europe', 0.2, 95.2),
+    ('Asia', 0.15, 87.3),
+    ('South America', 0.1, 75.1),
+    ('Africa', 0.08, 68.4),
+    ('Oceania', 0.07, 82.7),
+)
+GLOBAL_COVERAGE = 92.1
+
+
+@lru_cache(maxsize=8)
+def coverage_regions(total_satellites):
+    """Return the region list for a constellation size.
+    
+    The total only changes when new TLE data arrives, so the list is built
+    once per total and shared; callers must not modify it.
+    """
+    return [
+        {
+            'name': name,
+            'satellite_count': int(total_satellites * share),
+            'coverage_percentage': coverage
+        }
+        for name, share, coverage in COVERAGE_REGIONS
+    ]
+
 @app.route('/api/coverage')
 @handle_api_errors
 @cached(ttl=3600)  # Cache for 1 hour
@@ -504,40 +883,9 @@ def api_coverage():
         total_satellites = len(satellites) if satellites else 0
         
         coverage_data = {
-            'regions': [
-                {
-                    'name': 'North America',
-                    'satellite_count': int(total_satellites * 0.4),
-                    'coverage_percentage': 98.5
-                },
-                {
-                    'name': 'Europe',
-                    'satellite_count': int(total_satellites * 0.2),
-                    'coverage_percentage': 95.2
-                },
-                {
-                    'name': 'Asia',
-                    'satellite_count': int(total_satellites * 0.15),
-                    'coverage_percentage': 87.3
-                },
-                {
-                    'name': 'South America',
-                    'satellite_count': int(total_satellites * 0.1),
-                    'coverage_percentage': 75.1
-                },
-                {
-                    'name': 'Africa',
-                    'satellite_count': int(total_satellites * 0.08),
-                    'coverage_percentage': 68.4
-                },
-                {
-                    'name': 'Oceania',
-                    'satellite_count': int(total_satellites * 0.07),
-                    'coverage_percentage': 82.7
-                }
-            ],
+            'regions': coverage_regions(total_satellites),
             'total_satellites': total_satellites,
-            'global_coverage': 92.1,
+            'global_coverage': GLOBAL_COVERAGE,
             'generated': datetime.now().isoformat()
         }
         
@@ -566,6 +914,37 @@ def api_satellite_info(satellite_name):
         app.logger.error(f"Error in api_satellite_info: {e}")
         return jsonify({'error': 'Failed to get satellite information'}), 500
 
+# Search arrays for the most recent satellite list:
+# (data version, satellites, uppercase names, lowercase names,
+#  NORAD id strings, satellite id -> position)
+_search_arrays = None
+
+def get_search_arrays(satellites, version=None):
+    """Return name, NORAD id and position lookups for searching ``satellites``.
+    
+    The arrays cover the tracker's full satellite list and are rebuilt
+    only when ``version`` (the tracker's loaded TLE file key) changes;
+    without a version the list object itself identifies the data.
+    Candidate subsets are searched by indexing into these arrays with the
+    positions of their satellites.
+    """
+    global _search_arrays
+    cached_arrays = _search_arrays
+    if (cached_arrays is not None and cached_arrays[0] == version
+            and (version is not None or cached_arrays[1] is satellites)):
+        return cached_arrays[2:]
+    
+    names = [sat.name for sat in satellites]
+    arrays = (
+        np.array([name.upper() for name in names], dtype=str),
+        np.array([name.lower() for name in names], dtype=str),
+        np.array([str(sat.model.satnum) for sat in satellites], dtype=str),
+        {id(sat): i for i, sat in enumerate(satellites)},
+    )
+    # The list is kept alongside so the ids in the position map stay valid
+    _search_arrays = (version, satellites) + arrays
+    return arrays
+
 @app.route('/api/search')
 @handle_api_errors
 @cached(ttl=300)  # Cache for 5 minutes
@@ -590,18 +969,20 @@ def api_search():
         
         # Build search index if not already built or if using full tracker
         if hasattr(tracker_instance, '_build_search_index') and satellites:
-            # Check if we need to rebuild the index (every 5 minutes)
-            if (not hasattr(tracker_instance, '_last_update') or 
-                tracker_instance._last_update is None or 
-                (datetime.now() - tracker_instance._last_update).total_seconds() > 300):  # 5 minutes
+            # Check if we need to rebuild the index (every 5 minutes);
+            # _last_update is a monotonic timestamp
+            last_update = getattr(tracker_instance, '_last_update', None)
+            now = time.monotonic()
+            if last_update is None or now - last_update > 300:  # 5 minutes
                 tracker_instance._build_search_index(satellites)
-                tracker_instance._last_update = datetime.now()
+                tracker_instance._last_update = now
         
         # Search for matching satellites using index
         matches = []
         query_lower = query.lower()
         
         # Use index for faster searching if available
+        candidates = None
         satellite_index = getattr(tracker_instance, '_satellite_index', None)
         if satellite_index and hasattr(satellite_index, 'items'):
             # Try to find matches in index first
@@ -618,43 +999,57 @@ def api_search():
                         potential_matches.update(sats)
             except Exception:
                 # Fallback to linear search if index is corrupted
-                satellite_list = satellites
+                candidates = None
             else:
-                # Convert to list for processing
-                satellite_list = list(potential_matches)
+                candidates = potential_matches
+        
+        # Match the query against all candidates in one vectorized pass over
+        # the arrays of the full list, restricted to the candidates' positions
+        names_upper, names_lower, sat_ids, positions = get_search_arrays(
+            satellites, getattr(tracker_instance, '_loaded_tle_key', None))
+        candidate_indices = None
+        if candidates is not None:
+            candidate_indices = np.array(
+                sorted({positions[id(sat)] for sat in candidates if id(sat) in positions}), dtype=np.intp)
+            names_upper = names_upper[candidate_indices]
+            names_lower = names_lower[candidate_indices]
+            sat_ids = sat_ids[candidate_indices]
+        if search_type == 'all':
+            # Search in name, ID, and patterns
+            mask = ((np.char.find(names_upper, query) >= 0) |
+                    (np.char.find(sat_ids, query) >= 0) |
+                    (np.char.find(names_lower, query_lower) >= 0))
+        elif search_type == 'name':
+            # Search only in name
+            mask = np.char.find(names_upper, query) >= 0
+        elif search_type == 'id':
+            # Search only in ID
+            mask = np.char.find(sat_ids, query) >= 0
+        elif search_type == 'pattern':
+            # Pattern matching
+            mask = np.char.find(names_lower, query_lower) >= 0
         else:
-            # Fallback to linear search
-            satellite_list = satellites
+            mask = np.zeros(len(names_upper), dtype=bool)
+        matched = np.flatnonzero(mask)
+        if candidate_indices is not None:
+            matched = candidate_indices[matched]
+        
+        # One time point for all matches (ts is not available in MinimalTracker)
+        ts = getattr(tracker_instance, 'ts', None)
+        t = ts.now() if ts is not None else None
         
         # Process matches
-        for sat in satellite_list:
+        for index in matched:
+            sat = satellites[index]
             sat_name = sat.name
-            sat_name_lower = sat_name.lower()
-            sat_id = str(sat.model.satnum)
-            
-            # Different search types
-            match = False
-            if search_type == 'all':
-                # Search in name, ID, and patterns
-                match = (query in sat_name.upper() or 
-                        query in sat_id or
-                        query_lower in sat_name_lower)
-            elif search_type == 'name':
-                # Search only in name
-                match = query in sat_name.upper()
-            elif search_type == 'id':
-                # Search only in ID
-                match = query in sat_id
-            elif search_type == 'pattern':
-                # Pattern matching
-                match = query_lower in sat_name_lower
+            satnum = sat.model.satnum
+            elements = None
+            match = True
             
             # Apply additional filters if match found
             if match and (min_altitude or max_altitude or min_inclination or max_inclination):
                 try:
-                    # Check if tracker has ts attribute (not available in MinimalTracker)
-                    if hasattr(tracker_instance, 'ts') and tracker_instance.ts is not None:
-                        t = tracker_instance.ts.now()
+                    if t is not None:
                         elements = sat.orbit_elements_at(t)
                         
                         # Apply altitude filter (semi-major axis)
@@ -675,16 +1070,14 @@ def api_search():
                 # Get additional satellite info
                 sat_info = {
                     'name': sat_name,
-                    'id': sat.model.satnum,
-                    'short_name': sat_name.split('-')[-1] if '-' in sat_name else sat_name,
-                    'norad_cat_id': sat.model.satnum
+                    'id': satnum,
+                    'short_name': sat_name.rpartition('-')[2],
+                    'norad_cat_id': satnum
                 }
                 
                 # Add orbital information if available
                 try:
-                    # Check if tracker has ts attribute (not available in MinimalTracker)
-                    if hasattr(tracker_instance, 'ts') and tracker_instance.ts is not None:
-                        t = tracker_instance.ts.now()
+                    if t is not None:
                         geocentric = sat.at(t)
                         subpoint = geocentric.subpoint()
                         sat_info['position'] = {
@@ -693,8 +1086,9 @@ def api_search():
                             'altitude_km': round(subpoint.elevation.km, 2)
                         }
                         
-                        # Add orbital elements
-                        elements = sat.orbit_elements_at(t)
+                        # Add orbital elements, reusing those from the filters
+                        if elements is None:
+                            elements = sat.orbit_elements_at(t)
                         sat_info['orbital_elements'] = {
                             'inclination_deg': round(elements.inclination.degrees, 4),
                             'eccentricity': round(elements.eccentricity, 6),
@@ -742,8 +1136,6 @@ def api_search():
 def api_export(format):
     """API endpoint for exporting data in various formats."""
     try:
-        from utils.data_processor import DataProcessor
-        
         # Initialize processor with config
         processor = DataProcessor()
         
@@ -757,26 +1149,15 @@ def api_export(format):
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f'starlink_export_{timestamp}'
         
+        # Serialize in memory and send the body directly, instead of writing
+        # an export file and reading it back. JSON is a single orjson call;
+        # CSV rows are streamed in blocks as they are written.
         if format == 'json':
-            # Export to JSON
-            success = processor.export_to_json(satellites, filename + '.json')
-            if success:
-                # Return the data
-                try:
-                    with open(filename + '.json', 'r') as f:
-                        data = json.load(f)
-                    return jsonify(data)
-                except Exception:
-                    return jsonify({'message': 'Export completed successfully'}), 200
-            else:
-                return jsonify({'error': 'Failed to export data to JSON'}), 500
+            return Response(processor.export_json_bytes(satellites), mimetype='application/json',
+                            headers={'Content-Disposition': f'attachment; filename={filename}.json'})
         elif format == 'csv':
-            # Export to CSV
-            success = processor.export_to_csv(satellites, filename + '.csv')
-            if success:
-                return jsonify({'message': 'CSV export completed successfully'}), 200
-            else:
-                return jsonify({'error': 'Failed to export data to CSV'}), 500
+            return Response(processor.iter_csv_chunks(satellites), mimetype='text/csv',
+                            headers={'Content-Disposition': f'attachment; filename={filename}.csv'})
         else:
             return jsonify({'error': f'Unsupported format: {format}'}), 400
     except Exception as e:
@@ -789,12 +1170,12 @@ def clear_cache():
     """API endpoint to clear the cache."""
     try:
         api_cache.clear()
-        # Try to clear tracker caches if method exists
-        if hasattr(tracker_instance, 'clear_caches'):
+        # Clearing tracker caches is best effort; the API cache is already empty
+        if _clear_tracker_caches is not None:
             try:
-                tracker_instance.clear_caches()
-            except:
-                pass  # Ignore errors when clearing tracker caches
+                _clear_tracker_caches()
+            except Exception:
+                app.logger.exception("Failed to clear tracker caches")
         return jsonify({'message': 'Cache cleared successfully'})
     except Exception as e:
         app.logger.error(f"Error clearing cache: {e}")
@@ -889,21 +1270,17 @@ def api_visualize_orbits():
 def api_statistics():
     """API endpoint for satellite pass statistics."""
     try:
-        from utils.data_processor import DataProcessor
-        
         # Get location parameters from request or use defaults
-        lat = float(request.args.get('lat', DEFAULT_LATITUDE))
-        lon = float(request.args.get('lon', DEFAULT_LONGITUDE))
-        hours = int(request.args.get('hours', 24))
-        min_elevation = int(float(request.args.get('min_elevation', 10)))
+        try:
+            lat, lon, hours = parse_location_args()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        try:
+            min_elevation = int(float(request.args.get('min_elevation', 10)))
+        except ValueError:
+            return jsonify({'error': 'Invalid parameter format.'}), 400
         
         # Validate parameters
-        if not (-90 <= lat <= 90):
-            return jsonify({'error': 'Invalid latitude. Must be between -90 and 90.'}), 400
-        if not (-180 <= lon <= 180):
-            return jsonify({'error': 'Invalid longitude. Must be between -180 and 180.'}), 400
-        if not (1 <= hours <= 168):  # Max 1 week
-            return jsonify({'error': 'Invalid hours. Must be between 1 and 168.'}), 400
         if not (0 <= min_elevation <= 90):
             return jsonify({'error': 'Invalid min_elevation. Must be between 0 and 90.'}), 400
         
@@ -1000,20 +1377,11 @@ def api_anomalies():
 def api_ml_predictions():
     """API endpoint for ML-based satellite pass predictions."""
     try:
-        from utils.data_processor import DataProcessor
-        
         # Get location parameters from request or use defaults
-        lat = float(request.args.get('lat', DEFAULT_LATITUDE))
-        lon = float(request.args.get('lon', DEFAULT_LONGITUDE))
-        hours = int(request.args.get('hours', 24))
-        
-        # Validate parameters
-        if not (-90 <= lat <= 90):
-            return jsonify({'error': 'Invalid latitude. Must be between -90 and 90.'}), 400
-        if not (-180 <= lon <= 180):
-            return jsonify({'error': 'Invalid longitude. Must be between -180 and 180.'}), 400
-        if not (1 <= hours <= 168):  # Max 1 week
-            return jsonify({'error': 'Invalid hours. Must be between 1 and 168.'}), 400
+        try:
+            lat, lon, hours = parse_location_args()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         # Predict passes
         passes = tracker_instance.predict_passes(lat, lon, hours_ahead=hours)
@@ -1046,6 +1414,25 @@ def internal_error(error):
     """Handle 500 errors."""
     return jsonify({'error': 'Internal server error'}), 500
 
+def write_template(templates_dir, name, body):
+    """Write a template file unless it already holds exactly ``body``.
+    
+    Returns True when the file was written.
+    """
+    path = os.path.join(templates_dir, name)
+    data = body.encode('utf-8')
+    try:
+        # A size mismatch settles it without reading the file
+        if os.path.getsize(path) == len(data):
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    return False
+    except OSError:
+        pass
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
 def create_templates_dir():
     """Create templates directory with basic HTML files."""
     templates_dir = 'templates'
@@ -1129,8 +1516,7 @@ def create_templates_dir():
 </body>
 </html>'''
     
-    with open(os.path.join(templates_dir, 'base.html'), 'w', encoding='utf-8') as f:
-        f.write(base_html)
+    write_template(templates_dir, 'base.html', base_html)
     
     # Create index template
     index_html = '''{% extends "base.html" %}
@@ -1226,7 +1612,7 @@ fetch('/api/satellites')
     });
 
 // Fetch next pass and recent passes
-fetch('/api/passes?hours=48')
+fetch('/api/passes?hours=48&limit=5')
     .then(response => response.json())
     .then(data => {
         const nextPassContent = document.getElementById('next-pass-content');
@@ -1277,8 +1663,7 @@ fetch('/api/passes?hours=48')
 </script>
 {% endblock %}'''
     
-    with open(os.path.join(templates_dir, 'index.html'), 'w', encoding='utf-8') as f:
-        f.write(index_html)
+    write_template(templates_dir, 'index.html', index_html)
     
     # Create passes template
     passes_html = '''{% extends "base.html" %}
@@ -1330,9 +1715,9 @@ fetch('/api/passes?hours=48')
                 <span class="badge bg-secondary" id="pass-count">0 passes</span>
             </div>
             <div class="card-body">
-                <div class="table-responsive">
+                <div class="table-responsive" id="passes-scroll" style="max-height: 600px; overflow-y: auto;">
                     <table class="table table-striped table-hover">
-                        <thead class="table-dark">
+                        <thead class="table-dark" style="position: sticky; top: 0;">
                             <tr>
                                 <th>Satellite</th>
                                 <th>Date & Time</th>
@@ -1355,42 +1740,134 @@ fetch('/api/passes?hours=48')
 </div>
 
 <script>
+// Only the rows in view (plus a margin) are in the DOM, so long pass
+// lists keep scrolling smoothly
+const PASS_OVERSCAN_ROWS = 10;
+let passRows = [];
+let passRowHeight = 41; // px, re-measured from the first rendered row
+let renderedPassRange = null;
+// Rendered rows by pass, so re-renders and refreshes reuse the rows of
+// passes that are still shown and only rebuild rows whose content changed
+let passRowCache = new Map();
+
+// A pass is identified by its satellite and time
+function passKey(pass) {
+    return `${pass.satellite}|${pass.time}`;
+}
+
+// Build the cells of one pass row
+function passRowHtml(pass) {
+    return `
+        <td>${pass.satellite}</td>
+        <td>${new Date(pass.time).toLocaleString()}</td>
+        <td>
+            <div class="d-flex align-items-center">
+                <span>${pass.altitude}°</span>
+                <div class="progress ms-2" style="width: 100px; height: 5px;">
+                    <div class="progress-bar" role="progressbar" 
+                         style="width: ${pass.bar_pct}%" 
+                         aria-valuenow="${pass.altitude}" aria-valuemin="0" aria-valuemax="90"></div>
+                </div>
+            </div>
+        </td>
+        <td>${pass.azimuth}°</td>
+        <td>${pass.distance} km</td>
+        <td>~${pass.duration_min} min</td>
+    `;
+}
+
+// Empty row standing in for the rows scrolled out of view
+function passSpacerRow(height) {
+    const row = document.createElement('tr');
+    row.style.height = `${height}px`;
+    row.innerHTML = '<td colspan="6" class="p-0 border-0"></td>';
+    return row;
+}
+
+// Render the rows visible in the scroll container
+function renderVisiblePasses(force) {
+    const container = document.getElementById('passes-scroll');
+    const tableBody = document.getElementById('passes-table');
+    let start = Math.max(0, Math.floor(container.scrollTop / passRowHeight) - PASS_OVERSCAN_ROWS);
+    // The leading spacer takes the first row, so start on an odd index to
+    // keep every pass on the same stripe while scrolling
+    if (start > 0 && start % 2 === 0) {
+        start -= 1;
+    }
+    const end = Math.min(passRows.length,
+        Math.ceil((container.scrollTop + container.clientHeight) / passRowHeight) + PASS_OVERSCAN_ROWS);
+    if (!force && renderedPassRange && renderedPassRange[0] === start && renderedPassRange[1] === end) {
+        return;
+    }
+    renderedPassRange = [start, end];
+    
+    // Build the rows off-document and insert them in one step
+    const fragment = document.createDocumentFragment();
+    if (start > 0) {
+        fragment.appendChild(passSpacerRow(start * passRowHeight));
+    }
+    const nextRowCache = new Map();
+    for (let i = start; i < end; i++) {
+        const pass = passRows[i];
+        const key = passKey(pass);
+        let cachedRow = passRowCache.get(key);
+        if (!cachedRow) {
+            cachedRow = {row: document.createElement('tr'), html: null, pass: null};
+        }
+        // Markup is built once per pass object; scrolling back to a row
+        // skips formatting its date and cells again
+        if (cachedRow.pass !== pass) {
+            const html = passRowHtml(pass);
+            if (cachedRow.html !== html) {
+                cachedRow.row.innerHTML = html;
+                cachedRow.html = html;
+            }
+            cachedRow.pass = pass;
+        }
+        nextRowCache.set(key, cachedRow);
+        fragment.appendChild(cachedRow.row);
+    }
+    // Rows that left the view are dropped
+    passRowCache = nextRowCache;
+    if (end < passRows.length) {
+        fragment.appendChild(passSpacerRow((passRows.length - end) * passRowHeight));
+    }
+    tableBody.replaceChildren(fragment);
+}
+
+let passScrollPending = false;
+document.getElementById('passes-scroll').addEventListener('scroll', function() {
+    if (passRows.length === 0 || passScrollPending) {
+        return;
+    }
+    passScrollPending = true;
+    requestAnimationFrame(() => {
+        passScrollPending = false;
+        renderVisiblePasses(false);
+    });
+});
+
 // Function to fetch and display passes
 function fetchPasses(lat, lon, hours) {
     const tableBody = document.getElementById('passes-table');
+    passRows = [];
     tableBody.innerHTML = '<tr><td colspan="6" class="text-center">Loading passes...</td></tr>';
     
     fetch(`/api/passes?lat=${lat}&lon=${lon}&hours=${hours}`)
         .then(response => response.json())
         .then(data => {
-            tableBody.innerHTML = '';
             document.getElementById('pass-count').textContent = `${data.passes.length} passes`;
             
             if (data.passes && data.passes.length > 0) {
-                data.passes.forEach(pass => {
-                    const row = document.createElement('tr');
-                    // Calculate approximate duration (this is a simplified calculation)
-                    const duration = Math.max(1, Math.round(pass.altitude / 10)); // In minutes
-                    
-                    row.innerHTML = `
-                        <td>${pass.satellite}</td>
-                        <td>${new Date(pass.time).toLocaleString()}</td>
-                        <td>
-                            <div class="d-flex align-items-center">
-                                <span>${pass.altitude}°</span>
-                                <div class="progress ms-2" style="width: 100px; height: 5px;">
-                                    <div class="progress-bar" role="progressbar" 
-                                         style="width: ${Math.min(100, pass.altitude)}%" 
-                                         aria-valuenow="${pass.altitude}" aria-valuemin="0" aria-valuemax="90"></div>
-                                </div>
-                            </div>
-                        </td>
-                        <td>${pass.azimuth}°</td>
-                        <td>${pass.distance} km</td>
-                        <td>~${duration} min</td>
-                    `;
-                    tableBody.appendChild(row);
-                });
+                passRows = data.passes;
+                document.getElementById('passes-scroll').scrollTop = 0;
+                renderVisiblePasses(true);
+                // Size the spacers from a real row once one is on screen
+                const firstRow = tableBody.querySelector('tr:not([style])');
+                if (firstRow && firstRow.offsetHeight > 0 && firstRow.offsetHeight !== passRowHeight) {
+                    passRowHeight = firstRow.offsetHeight;
+                    renderVisiblePasses(true);
+                }
             } else {
                 tableBody.innerHTML = '<tr><td colspan="6" class="text-center">No passes found for the specified location and time period</td></tr>';
             }
@@ -1419,8 +1896,7 @@ document.addEventListener('DOMContentLoaded', function() {
 </script>
 {% endblock %}'''
     
-    with open(os.path.join(templates_dir, 'passes.html'), 'w', encoding='utf-8') as f:
-        f.write(passes_html)
+    write_template(templates_dir, 'passes.html', passes_html)
     
     # Create coverage template
     coverage_html = '''{% extends "base.html" %}
@@ -1521,9 +1997,10 @@ fetch('/api/coverage')
     .then(data => {
         // Update regional coverage statistics
         const statsTable = document.getElementById('coverage-stats');
-        statsTable.innerHTML = '';
         
         if (data.regions && data.regions.length > 0) {
+            // Build the rows off-document and insert them in one step
+            const fragment = document.createDocumentFragment();
             data.regions.forEach(region => {
                 const row = document.createElement('tr');
                 row.innerHTML = `
@@ -1540,8 +2017,9 @@ fetch('/api/coverage')
                         </div>
                     </td>
                 `;
-                statsTable.appendChild(row);
+                fragment.appendChild(row);
             });
+            statsTable.replaceChildren(fragment);
         } else {
             statsTable.innerHTML = '<tr><td colspan="3" class="text-center">No coverage data available</td></tr>';
         }
@@ -1558,8 +2036,7 @@ fetch('/api/coverage')
 </script>
 {% endblock %}'''
     
-    with open(os.path.join(templates_dir, 'coverage.html'), 'w', encoding='utf-8') as f:
-        f.write(coverage_html)
+    write_template(templates_dir, 'coverage.html', coverage_html)
     
     # Create settings template
     settings_html = '''{% extends "base.html" %}
@@ -1674,7 +2151,7 @@ fetch('/api/coverage')
                         <h6>Scheduler Settings</h6>
                         <div class="mb-3">
                             <label for="tle-update-cron" class="form-label">TLE Update Schedule</label>
-                            <input type="text" class="form-control" id="tle-update-cron" value="0 0 */6 * *">
+                            <input type="text" class="form-control" id="tle-update-cron" value="0 */6 * * *">
                             <div class="form-text">Cron expression for TLE updates</div>
                         </div>
                         <div class="mb-3">
@@ -1723,8 +2200,7 @@ document.getElementById('clear-cache').addEventListener('click', function() {
 </script>
 {% endblock %}'''
     
-    with open(os.path.join(templates_dir, 'settings.html'), 'w', encoding='utf-8') as f:
-        f.write(settings_html)
+    write_template(templates_dir, 'settings.html', settings_html)
     
     # Create export template
     export_html = '''{% extends "base.html" %}
@@ -1853,8 +2329,7 @@ document.getElementById('export-form').addEventListener('submit', function(e) {
 </script>
 {% endblock %}'''
     
-    with open(os.path.join(templates_dir, 'export.html'), 'w', encoding='utf-8') as f:
-        f.write(export_html)
+    write_template(templates_dir, 'export.html', export_html)
 
 
 @app.route('/api/satellites/advanced-search')
@@ -9,6 +9,36 @@ import os
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+def run_track(args):
+    """Run the tracker command line with the remaining arguments."""
+    from core.main import main as track_main
+    # Remove the first argument (script name) and 'track' command
+    sys.argv = [sys.argv[0]] + args
+    track_main()
+
+def run_web(args):
+    """Start the web interface.
+
+    The debugger and its reloader are enabled with --debug only; the reloader
+    runs the app in a second process, importing and loading everything twice.
+    """
+    from web.web_app import app
+    app.run(debug='--debug' in args, host='0.0.0.0', port=5000)
+
+def run_ar(args):
+    """Start the web interface and point to the AR view."""
+    print("Starting AR view web interface...")
+    print("Open your browser to http://localhost:5000/ar")
+    run_web(args)
+
+# Command handlers; each imports only the modules its command needs
+COMMANDS = {
+    'track': run_track,
+    'web': run_web,
+    'ar': run_ar,
+    'help': lambda args: None,
+}
+
 def main():
     """Main entry point."""
     print("Starlink Satellite Tracker")
@@ -17,6 +47,7 @@ def main():
     print("  python starlink_tracker.py track     - Track satellites")
     print("  python starlink_tracker.py track --schedule - Start tracking with scheduler")
     print("  python starlink_tracker.py web       - Start web interface")
+    print("  python starlink_tracker.py web --debug - Start web interface with debugger and reloader")
     print("  python starlink_tracker.py ar        - Start AR view (web interface)")
     print("  python starlink_tracker.py help      - Show this help")
     
@@ -24,26 +55,12 @@ def main():
         return
     
     command = sys.argv[1]
-    
-    if command == "track":
-        # Pass all arguments to the track command
-        from core.main import main as track_main
-        # Remove the first argument (script name) and 'track' command
-        sys.argv = [sys.argv[0]] + sys.argv[2:]
-        track_main()
-    elif command == "web":
-        from web.web_app import app
-        app.run(debug=True, host='0.0.0.0', port=5000)
-    elif command == "ar":
-        from web.web_app import app
-        print("Starting AR view web interface...")
-        print("Open your browser to http://localhost:5000/ar")
-        app.run(debug=True, host='0.0.0.0', port=5000)
-    elif command == "help":
-        pass
-    else:
+    handler = COMMANDS.get(command)
+    if handler is None:
         print(f"Unknown command: {command}")
         print("Use 'python starlink_tracker.py help' for available commands")
+        return
+    handler(sys.argv[2:])
 
 if __name__ == "__main__":
     main()
\ No newline at end of file